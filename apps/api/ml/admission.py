@@ -0,0 +1,192 @@
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Optional
+
+# Highest priority first: a free slot always goes to a waiting interactive call
+LANES = ("interactive", "batch")
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot start within its deadline; retry_after is in whole seconds"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ("lane", "future")
+
+    def __init__(self, lane: str, future: asyncio.Future):
+        self.lane = lane
+        self.future = future
+
+
+class AdmissionController:
+    """
+    Deadline-aware admission in front of inference.
+
+    At most concurrency requests run at once; the batch lane may use at most
+    batch_concurrency of those slots, so single predictions always have room.
+    Waiters queue per lane (max_queue in total) and freed slots go to the
+    interactive lane first. A request is rejected up front when the queue is
+    full or when the expected wait, estimated from each lane's moving average
+    of service times, is longer than its deadline; one that is still queued when its
+    deadline passes is rejected too. Rejections carry a Retry-After estimate.
+    Only the event loop thread touches this state, so no lock is needed.
+    """
+
+    def __init__(self, concurrency: int = 10, max_queue: int = 100, batch_concurrency: Optional[int] = None,
+                 deadlines: Optional[Dict[str, float]] = None,
+                 wait_observer: Optional[Callable[[str, float], None]] = None):
+        if concurrency <= 0:
+            raise ValueError("concurrency must be positive")
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.lane_limits = {
+            "interactive": concurrency,
+            "batch": min(concurrency, batch_concurrency or max(1, concurrency // 2))
+        }
+        self.deadlines = {"interactive": 2.0, "batch": 10.0, **(deadlines or {})}
+        self.wait_observer = wait_observer
+
+        self._queues: Dict[str, Deque[_Waiter]] = {lane: deque() for lane in LANES}
+        self._running = {lane: 0 for lane in LANES}
+        # Per lane, so slow batch work does not inflate the interactive estimate
+        self._service_ewma = {lane: 0.0 for lane in LANES}
+
+        self.admitted = {lane: 0 for lane in LANES}
+        self.rejected = {lane: {"queue_full": 0, "expected_wait": 0, "deadline": 0} for lane in LANES}
+
+    @property
+    def in_flight(self) -> int:
+        return sum(self._running.values())
+
+    @property
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    @asynccontextmanager
+    async def admit(self, lane: str, deadline: Optional[float] = None) -> AsyncIterator[None]:
+        """Hold a slot in lane for the body of the block; deadline is in seconds from now"""
+        await self.acquire(lane, deadline)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(lane, time.perf_counter() - started)
+
+    async def acquire(self, lane: str, deadline: Optional[float] = None) -> None:
+        if lane not in self._queues:
+            raise ValueError(f"lane must be one of {LANES}")
+        budget = self.deadlines[lane] if deadline is None else deadline
+        enqueued_at = time.perf_counter()
+
+        if self._has_slot(lane) and not self._waiters_ahead(lane):
+            self._start(lane, 0.0)
+            return
+
+        expected = self.expected_wait(lane)
+        if self.queued >= self.max_queue:
+            self._reject(lane, "queue_full", f"Admission queue is full ({self.queued} waiting)", expected)
+        if expected > budget:
+            self._reject(lane, "expected_wait",
+                         f"Expected wait {expected * 1000:.0f}ms exceeds the {budget * 1000:.0f}ms deadline",
+                         expected)
+
+        waiter = _Waiter(lane, asyncio.get_running_loop().create_future())
+        self._queues[lane].append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout=budget)
+        except asyncio.TimeoutError:
+            if not self._abandon(waiter):
+                self._record_wait(lane, time.perf_counter() - enqueued_at)
+                return
+            self._reject(lane, "deadline", f"Deadline of {budget * 1000:.0f}ms passed while queued",
+                         self.expected_wait(lane))
+        except asyncio.CancelledError:
+            # The slot may have been granted just as the caller went away
+            if not self._abandon(waiter):
+                self.release(lane, 0.0)
+            raise
+
+        self._record_wait(lane, time.perf_counter() - enqueued_at)
+
+    def release(self, lane: str, service_seconds: float) -> None:
+        self._running[lane] -= 1
+        if service_seconds > 0.0:
+            ewma = self._service_ewma[lane]
+            self._service_ewma[lane] = service_seconds if ewma == 0.0 else 0.8 * ewma + 0.2 * service_seconds
+        self._dispatch()
+
+    def expected_wait(self, lane: str) -> float:
+        """Seconds a request joining lane now would wait for a slot"""
+        interactive = len(self._queues["interactive"]) * self._service_ewma["interactive"]
+        if lane == "interactive":
+            return (interactive + self._service_ewma["interactive"]) / self.concurrency
+        # Interactive waiters overtake batch ones, so they count too
+        batch = (len(self._queues["batch"]) + 1) * self._service_ewma["batch"]
+        return (interactive + batch) / self.lane_limits["batch"]
+
+    @staticmethod
+    def retry_after(expected_wait: float) -> int:
+        return max(1, math.ceil(expected_wait))
+
+    def _has_slot(self, lane: str) -> bool:
+        return self.in_flight < self.concurrency and self._running[lane] < self.lane_limits[lane]
+
+    def _waiters_ahead(self, lane: str) -> bool:
+        if lane == "interactive":
+            return bool(self._queues["interactive"])
+        return self.queued > 0
+
+    def _start(self, lane: str, wait_seconds: float) -> None:
+        self._running[lane] += 1
+        self.admitted[lane] += 1
+        self._record_wait(lane, wait_seconds)
+
+    def _record_wait(self, lane: str, wait_seconds: float) -> None:
+        if self.wait_observer is not None:
+            self.wait_observer(lane, wait_seconds)
+
+    def _dispatch(self) -> None:
+        for lane in LANES:
+            queue = self._queues[lane]
+            while queue and self._has_slot(lane):
+                waiter = queue.popleft()
+                self._running[lane] += 1
+                self.admitted[lane] += 1
+                waiter.future.set_result(None)
+
+    def _abandon(self, waiter: _Waiter) -> bool:
+        """Drop a waiter that gave up; False if it had already been granted a slot"""
+        if waiter.future.done():
+            return False
+        self._queues[waiter.lane].remove(waiter)
+        waiter.future.cancel()
+        return True
+
+    def _reject(self, lane: str, reason: str, message: str, expected_wait: float) -> None:
+        self.rejected[lane][reason] += 1
+        raise AdmissionRejected(message, self.retry_after(expected_wait))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "max_queue": self.max_queue,
+            "lanes": {
+                lane: {
+                    "limit": self.lane_limits[lane],
+                    "deadline_ms": self.deadlines[lane] * 1000.0,
+                    "running": self._running[lane],
+                    "queued": len(self._queues[lane]),
+                    "service_ewma_ms": round(self._service_ewma[lane] * 1000.0, 3),
+                    "admitted": self.admitted[lane],
+                    "rejected": dict(self.rejected[lane])
+                }
+                for lane in LANES
+            }
+        }
@@ -1,29 +1,81 @@
 
 from fastapi import FastAPI, Request, status, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, Response
 import traceback
 import sys
-from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
-from predictionModel import MagajiCoMLPredictor
+from pydantic import BaseModel, Field, ValidationError
+from typing import List, Dict, Any, Literal, Optional
+from predictionModel import MagajiCoMLPredictor, check_incremental_labels
+from prediction_cache import PredictionCache
+from batching import PredictionCoalescer
+from executors import PoolSaturated, WorkerPools
+from admission import AdmissionController, AdmissionRejected
+from training_jobs import TrainingJobManager
+from datasets import DatasetStore
+from model_registry import ModelNotFound, ModelRegistry, RegistryEntry
+from shared_model import SharedModelStore
+from metrics import BATCH_ROWS_BUCKETS, MetricsRegistry, RequestMetricsMiddleware
+from columnar import UnsupportedMediaType, decode_matrix, encode_probabilities, is_binary, media_type
+from streaming import RequestStreamingResponse, format_results, iter_ndjson_chunks
+from rate_limiter import LocalBucketBackend, RateLimit, RateLimiter, RedisBucketBackend, parse_route_limits
 from contextlib import asynccontextmanager
 import uvicorn
 import os
-import asyncio
-from collections import deque
 import time
 from datetime import datetime
 
-# Request queue for load management
-request_queue = deque(maxlen=1000)
-processing_semaphore = asyncio.Semaphore(10)
+def serve() -> None:
+    """
+    Entry point for python api.py. The app below is only built when uvicorn
+    imports this module as "api", in each worker process.
+    """
+    port = int(os.getenv("PORT", os.getenv("ML_PORT", 8000)))
+    environment = os.getenv("ENVIRONMENT", "development")
+
+    workers = int(os.getenv("ML_WORKERS", 1))
+
+    if workers > 1:
+        # Supervisor: only creates the shared store; the first worker to start
+        # publishes its model there and every other worker maps it read-only
+        shared_model_store = SharedModelStore.create()
+        os.environ["ML_SHARED_MODEL"] = shared_model_store.control_path
+
+        print(f"🚀 ML Service starting on port {port} with {workers} workers")
+        try:
+            uvicorn.run(
+                "api:app",
+                host="0.0.0.0",
+                port=port,
+                workers=workers,
+                log_level="info"
+            )
+        finally:
+            shared_model_store.unlink()
+    else:
+        print(f"🚀 ML Service starting on port {port}")
+
+        uvicorn.run(
+            "api:app",
+            host="0.0.0.0",
+            port=port,
+            reload=(environment == "development"),
+            log_level="info"
+        )
+
+if __name__ == "__main__":
+    serve()
+    sys.exit(0)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     app.state.start_time = time.time()
     print("🚀 ML Service started successfully")
     yield
+    if coalescer is not None:
+        await coalescer.close()
+    worker_pools.shutdown()
     print("👋 ML Service shutting down")
 
 app = FastAPI(
@@ -33,26 +85,45 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+def create_rate_limiter() -> RateLimiter:
+    redis_url = os.getenv("ML_RATE_LIMIT_REDIS_URL")
+    if redis_url:
+        backend = RedisBucketBackend(redis_url)
+    else:
+        backend = LocalBucketBackend(max_clients=int(os.getenv("ML_RATE_LIMIT_MAX_CLIENTS", 10000)))
+
+    per_minute = int(os.getenv("ML_RATE_LIMIT_PER_MINUTE", 100))
+    burst = os.getenv("ML_RATE_LIMIT_BURST")
+    return RateLimiter(
+        backend,
+        default_limit=RateLimit(per_minute, burst=int(burst) if burst else None),
+        route_limits=parse_route_limits(os.getenv("ML_RATE_LIMIT_ROUTES", "/train=10,/train/dataset=10"))
+    )
+
+rate_limiter = create_rate_limiter()
+# Load balancer probes and metric scrapes must never be throttled
+RATE_LIMIT_EXEMPT_PATHS = {"/health", "/metrics"}
+
 @app.middleware("http")
 async def rate_limit_middleware(request: Request, call_next):
+    if request.url.path in RATE_LIMIT_EXEMPT_PATHS:
+        return await call_next(request)
+
     client_ip = request.client.host if request.client else "unknown"
-    current_time = time.time()
-
-    if not hasattr(app.state, 'rate_limits'):
-        app.state.rate_limits = {}
-
-    if client_ip in app.state.rate_limits:
-        requests, window_start = app.state.rate_limits[client_ip]
-        if current_time - window_start < 60:
-            if requests >= 100:
-                raise HTTPException(status_code=429, detail="Rate limit exceeded")
-            app.state.rate_limits[client_ip] = (requests + 1, window_start)
-        else:
-            app.state.rate_limits[client_ip] = (1, current_time)
-    else:
-        app.state.rate_limits[client_ip] = (1, current_time)
+    allowed, limit, remaining = await rate_limiter.check(client_ip, request.url.path)
+
+    if not allowed:
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={"detail": "Rate limit exceeded"},
+            headers={
+                "Retry-After": str(RateLimiter.retry_after(limit, remaining)),
+                "X-RateLimit-Limit": str(limit.requests)
+            }
+        )
 
     response = await call_next(request)
+    response.headers["X-RateLimit-Remaining"] = str(int(remaining))
     return response
 
 ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
@@ -71,8 +142,170 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-model_path = os.path.join(os.path.dirname(__file__), "model_data.pkl")
-predictor = MagajiCoMLPredictor(model_path=model_path)
+model_path = os.getenv("ML_MODEL_PATH") or os.path.join(os.path.dirname(__file__), "model_data.pkl")
+# Set by the multi-worker supervisor (see __main__); workers map its model read-only
+shared_model_store = SharedModelStore(os.environ["ML_SHARED_MODEL"]) if os.getenv("ML_SHARED_MODEL") else None
+
+# Per-process metrics, scraped from /metrics
+metrics = MetricsRegistry()
+request_latency = metrics.histogram(
+    "ml_http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status")
+)
+inference_stage_latency = metrics.histogram(
+    "ml_inference_stage_seconds", "Trained-model inference time split into scaler and model", ("stage",)
+)
+inference_batch_rows = metrics.histogram(
+    "ml_inference_batch_rows", "Rows per trained-model evaluation", buckets=BATCH_ROWS_BUCKETS
+)
+admission_wait = metrics.histogram("ml_admission_wait_seconds", "Time a request waits for an inference slot", ("lane",))
+scaler_latency = inference_stage_latency.labels("scaler")
+model_latency = inference_stage_latency.labels("model")
+
+def observe_inference(rows: int, scaler_seconds: float, model_seconds: float) -> None:
+    inference_batch_rows.observe(rows)
+    scaler_latency.observe(scaler_seconds)
+    model_latency.observe(model_seconds)
+
+# Bounded, deadline-aware queueing in front of inference; /predict outranks batch work
+admission = AdmissionController(
+    concurrency=int(os.getenv("ML_ADMISSION_CONCURRENCY", 10)),
+    max_queue=int(os.getenv("ML_ADMISSION_MAX_QUEUE", 100)),
+    batch_concurrency=int(os.getenv("ML_ADMISSION_BATCH_CONCURRENCY", 0)) or None,
+    deadlines={
+        "interactive": float(os.getenv("ML_DEADLINE_MS", 2000)) / 1000.0,
+        "batch": float(os.getenv("ML_BATCH_DEADLINE_MS", 10000)) / 1000.0
+    },
+    wait_observer=lambda lane, seconds: admission_wait.labels(lane).observe(seconds)
+)
+
+def request_deadline(request: Request) -> Optional[float]:
+    """Client deadline in seconds from the X-Deadline-Ms header, if sent"""
+    value = request.headers.get("x-deadline-ms")
+    if value is None:
+        return None
+    try:
+        deadline_ms = float(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="X-Deadline-Ms must be a number of milliseconds")
+    return max(0.0, deadline_ms) / 1000.0
+
+def overloaded(e: AdmissionRejected) -> HTTPException:
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+app.add_middleware(RequestMetricsMiddleware, histogram=request_latency, exclude_paths=("/metrics",))
+
+predictor = MagajiCoMLPredictor(
+    model_path=model_path,
+    inference_engine=os.getenv("ML_INFERENCE_ENGINE", "compiled"),
+    artifact_path=os.getenv("ML_MODEL_ARTIFACT") or None,
+    shared_store=shared_model_store,
+    inference_observer=observe_inference
+)
+
+def load_registry_model(entry: RegistryEntry) -> MagajiCoMLPredictor:
+    model = MagajiCoMLPredictor(
+        model_path=entry.model_path,
+        inference_engine=os.getenv("ML_INFERENCE_ENGINE", "compiled"),
+        artifact_path=entry.artifact_path,
+        inference_observer=observe_inference,
+        model_version=entry.id
+    )
+    if model.model_revision == 0:
+        raise ValueError(f"Model {entry.id} could not be loaded")
+    return model
+
+# Per-sport/league models, loaded on first request and evicted LRU over the budget
+model_registry = ModelRegistry(
+    os.getenv("ML_MODEL_REGISTRY_DIR") or os.path.join(os.path.dirname(__file__), "models"),
+    load=load_registry_model,
+    size=lambda model: model.nbytes,
+    memory_budget=int(float(os.getenv("ML_MODEL_REGISTRY_BUDGET_MB", 512)) * 1024 * 1024),
+    refresh_interval=float(os.getenv("ML_MODEL_REGISTRY_REFRESH_SECONDS", 30))
+)
+
+# Inference runs on threads, training in a separate process
+worker_pools = WorkerPools.from_env()
+
+prediction_cache = PredictionCache(
+    max_size=int(os.getenv("ML_CACHE_MAX_SIZE", 10000)),
+    ttl=float(os.getenv("ML_CACHE_TTL", 300))
+)
+
+# /train runs as a background job; the finished model is hot-swapped in
+# In multi-worker mode the job table and update lock live in the shared store, so every worker sees every job
+training_jobs = TrainingJobManager(
+    predictor, worker_pools, on_activate=prediction_cache.clear,
+    state_dir=shared_model_store.state_dir if shared_model_store is not None else None
+)
+
+# On-disk training sets for /train/dataset, read memory-mapped in the training process
+dataset_store = DatasetStore(os.getenv("ML_DATASET_DIR") or os.path.join(os.path.dirname(__file__), "datasets"))
+
+# Opt-in micro-batching of concurrent /predict calls
+coalescer = None
+if os.getenv("ML_COALESCE_ENABLED", "false").lower() == "true":
+    coalescer = PredictionCoalescer(
+        predictor.predict_batch,
+        window_ms=float(os.getenv("ML_COALESCE_WINDOW_MS", 2)),
+        max_batch_size=int(os.getenv("ML_COALESCE_MAX_BATCH", 64)),
+        run=worker_pools.run_inference
+    )
+
+metrics.counter_callback(
+    "ml_prediction_cache_hits", "Prediction cache hits", lambda: prediction_cache.stats()["hits"]
+)
+metrics.counter_callback(
+    "ml_prediction_cache_misses", "Prediction cache misses", lambda: prediction_cache.stats()["misses"]
+)
+metrics.gauge_callback(
+    "ml_prediction_cache_hit_ratio", "Prediction cache hits / lookups", lambda: prediction_cache.stats()["hit_ratio"]
+)
+metrics.gauge_callback("ml_prediction_cache_size", "Cached predictions", lambda: prediction_cache.stats()["size"])
+metrics.counter_callback(
+    "ml_rate_limit_rejections", "Requests rejected by the rate limiter", lambda: rate_limiter.rejected
+)
+metrics.counter_callback(
+    "ml_rate_limit_allowed", "Requests admitted by the rate limiter", lambda: rate_limiter.allowed
+)
+metrics.gauge_callback(
+    "ml_pool_in_flight", "Jobs running or queued per worker pool",
+    lambda: {(name,): pool["in_flight"] for name, pool in worker_pools.stats().items()}, ("pool",)
+)
+metrics.gauge_callback(
+    "ml_pool_capacity", "Jobs a worker pool accepts before rejecting",
+    lambda: {(pool.name,): pool.capacity for pool in (worker_pools.inference, worker_pools.training)}, ("pool",)
+)
+metrics.gauge_callback(
+    "ml_admission_queued", "Requests waiting for an inference slot",
+    lambda: {(lane,): lane_stats["queued"] for lane, lane_stats in admission.stats()["lanes"].items()}, ("lane",)
+)
+metrics.gauge_callback(
+    "ml_admission_running", "Requests holding an inference slot",
+    lambda: {(lane,): lane_stats["running"] for lane, lane_stats in admission.stats()["lanes"].items()}, ("lane",)
+)
+metrics.counter_callback(
+    "ml_admission_rejections", "Requests shed by admission control",
+    lambda: {
+        (lane, reason): count
+        for lane, lane_stats in admission.stats()["lanes"].items()
+        for reason, count in lane_stats["rejected"].items()
+    },
+    ("lane", "reason")
+)
+metrics.counter_callback(
+    "ml_pool_rejections", "Jobs rejected by a saturated worker pool",
+    lambda: {(name,): pool["rejected"] for name, pool in worker_pools.stats().items()}, ("pool",)
+)
+
+metrics.gauge_callback(
+    "ml_model_registry_memory_bytes", "Memory held by loaded registry models",
+    lambda: model_registry.stats()["memory_bytes"]
+)
+metrics.counter_callback("ml_model_registry_loads", "Registry models loaded", lambda: model_registry.loads)
+metrics.counter_callback(
+    "ml_model_registry_evictions", "Registry models evicted over the memory budget",
+    lambda: model_registry.evictions
+)
 
 class PredictionRequest(BaseModel):
     features: List[float] = Field(..., min_length=7, max_length=7)
@@ -84,6 +317,20 @@ class BatchPredictionRequest(BaseModel):
 class TrainingRequest(BaseModel):
     data: List[List[float]]
     labels: List[int]
+    # "incremental" grows the active model with this data instead of refitting from scratch;
+    # "search" picks forest size and depth by successive halving within time_budget_seconds
+    mode: Literal["full", "incremental", "search"] = "full"
+    new_trees: int = Field(20, ge=1, le=500)
+    max_trees: int = Field(300, ge=1, le=2000)
+    time_budget_seconds: float = Field(60.0, gt=0, le=3600)
+    min_accuracy: Optional[float] = Field(None, ge=0, le=1)
+
+class DatasetTrainingRequest(BaseModel):
+    # Dataset ID (a directory under ML_DATASET_DIR) or a path inside that directory
+    dataset: str
+    chunk_size: int = Field(1_000_000, ge=1000, le=20_000_000)
+    n_estimators: int = Field(100, ge=1, le=2000)
+    max_depth: Optional[int] = Field(10, ge=1, le=64)
 
 class PredictionResponse(BaseModel):
     model_config = {'protected_namespaces': ()}
@@ -93,6 +340,7 @@ class PredictionResponse(BaseModel):
     model_version: str
     features_used: List[float]
     match_context: Optional[Dict[str, str]] = None
+    cached: bool = False
 
 @app.get("/")
 async def root():
@@ -103,9 +351,21 @@ async def root():
         "endpoints": {
             "predict": "/predict",
             "batch": "/predict/batch",
+            "stream": "/predict/stream",
             "health": "/health",
             "model_info": "/model/info",
-            "train": "/train"
+            "metrics": "/metrics",
+            "cache_stats": "/cache/stats",
+            "coalescer_stats": "/coalescer/stats",
+            "pool_stats": "/pools/stats",
+            "admission_stats": "/admission/stats",
+            "models": "/models",
+            "rate_limit_stats": "/ratelimit/stats",
+            "train": "/train",
+            "train_dataset": "/train/dataset",
+            "train_status": "/train/{job_id}",
+            "datasets": "/datasets",
+            "rollback": "/model/rollback"
         }
     }
 
@@ -118,27 +378,88 @@ async def health_check():
         "timestamp": datetime.now().isoformat()
     }
 
+def sync_model() -> None:
+    """Pick up a model published by another worker and drop this worker's stale cache"""
+    if predictor.sync_shared_model():
+        prediction_cache.clear()
+
+async def select_model(sport: Optional[str], version: Optional[str]) -> MagajiCoMLPredictor:
+    """
+    The default model, or the registry model chosen by the sport/version query
+    parameters. A model that is not loaded yet is loaded on an inference thread.
+    """
+    if sport is None and version is None:
+        sync_model()
+        return predictor
+    try:
+        model_id = model_registry.resolve(sport, version)
+    except ModelNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    model = model_registry.peek(model_id)
+    if model is None:
+        try:
+            model = await worker_pools.run_inference(model_registry.get, model_id)
+        except PoolSaturated as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to load model {model_id}: {e}")
+    return model
+
 @app.get("/model/info")
-async def get_model_info():
-    return predictor.get_model_info()
+async def get_model_info(sport: Optional[str] = None, version: Optional[str] = None):
+    model = await select_model(sport, version)
+    return model.get_model_info()
 
-@app.post("/predict", response_model=PredictionResponse)
-async def predict(request: PredictionRequest):
-    import hashlib
-    cache_key = hashlib.md5(str(request.features).encode()).hexdigest()
+@app.get("/models")
+async def list_models():
+    return {"models": model_registry.list(), **model_registry.stats()}
+
+@app.get("/metrics")
+async def get_metrics():
+    return Response(content=metrics.render(), media_type=MetricsRegistry.CONTENT_TYPE)
 
-    if not hasattr(app.state, 'prediction_cache'):
-        app.state.prediction_cache = {}
+@app.get("/cache/stats")
+async def get_cache_stats():
+    return prediction_cache.stats()
 
-    if cache_key in app.state.prediction_cache:
-        cached_result, timestamp = app.state.prediction_cache[cache_key]
-        if time.time() - timestamp < 300:
-            cached_result['cached'] = True
-            return cached_result
+@app.get("/ratelimit/stats")
+async def get_rate_limit_stats():
+    return rate_limiter.stats()
+
+@app.get("/admission/stats")
+async def get_admission_stats():
+    return admission.stats()
+
+@app.get("/pools/stats")
+async def get_pool_stats():
+    return worker_pools.stats()
+
+@app.get("/coalescer/stats")
+async def get_coalescer_stats():
+    if coalescer is None:
+        return {"enabled": False}
+    return {"enabled": True, **coalescer.stats()}
+
+@app.post("/predict", response_model=PredictionResponse)
+async def predict(request: PredictionRequest, http_request: Request,
+                  sport: Optional[str] = None, version: Optional[str] = None):
+    model = await select_model(sport, version)
+    deadline = request_deadline(http_request)
+    cache_key = PredictionCache.make_key(model.model_key, request.features)
+
+    cached_result = prediction_cache.get(cache_key)
+    if cached_result is not None:
+        cached_result["cached"] = True
+        cached_result["match_context"] = request.match_context
+        return cached_result
 
     try:
-        async with processing_semaphore:
-            result = predictor.predict(request.features)
+        async with admission.admit("interactive", deadline):
+            if coalescer is not None and model is predictor:
+                # Every queued row holds an interactive slot, which also bounds the coalescer's queue
+                result = await coalescer.submit(request.features)
+            else:
+                result = await worker_pools.run_inference(model.predict, request.features)
 
         response = PredictionResponse(
             prediction=result["prediction"],
@@ -149,17 +470,47 @@ async def predict(request: PredictionRequest):
             match_context=request.match_context
         )
 
-        app.state.prediction_cache[cache_key] = (response.dict(), time.time())
+        prediction_cache.set(cache_key, response.model_dump())
         return response
+    except AdmissionRejected as e:
+        raise overloaded(e)
+    except PoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/predict/batch")
-async def batch_predict(request: BatchPredictionRequest):
+async def batch_predict(request: Request, sport: Optional[str] = None, version: Optional[str] = None):
+    """
+    JSON body: {"predictions": [{"features": [...], "match_context": {...}}]}.
+    Binary body (see columnar): an (N, 7) float32/float64 little-endian matrix
+    or an Arrow IPC stream, answered with (N, 3) home/draw/away probabilities
+    in the same format.
+    """
+    model = await select_model(sport, version)
+    deadline = request_deadline(request)
+    content_type = request.headers.get("content-type", "")
+    if is_binary(content_type):
+        return await binary_batch_predict(model, await request.body(), content_type, deadline)
+    if not is_json(content_type):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported content type {media_type(content_type)!r}"
+        )
+
+    try:
+        batch = BatchPredictionRequest.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise body_validation_error(e)
+
     try:
+        async with admission.admit("batch", deadline):
+            results = await worker_pools.run_inference(
+                model.predict_batch,
+                [pred_request.features for pred_request in batch.predictions]
+            )
         predictions = []
-        for pred_request in request.predictions:
-            result = predictor.predict(pred_request.features)
+        for pred_request, result in zip(batch.predictions, results):
             predictions.append({
                 "prediction": result["prediction"],
                 "confidence": result["confidence"] * 100,
@@ -172,19 +523,172 @@ async def batch_predict(request: BatchPredictionRequest):
             "success": True,
             "count": len(predictions),
             "predictions": predictions,
-            "model_version": predictor.model_version
+            "model_version": model.model_version
         }
+    except AdmissionRejected as e:
+        raise overloaded(e)
+    except PoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@app.post("/train")
-async def train_model(request: TrainingRequest):
+def is_json(content_type: str) -> bool:
+    """JSON bodies may omit the content type, as FastAPI's own body parsing allows"""
+    mtype = media_type(content_type)
+    return not mtype or mtype == "application/json" or mtype.endswith("+json")
+
+def body_validation_error(e: ValidationError) -> RequestValidationError:
+    """
+    Errors located under "body" as FastAPI reports them. Raw bytes inputs (an
+    undecodable body) are dropped, since they cannot be encoded in the 422.
+    """
+    errors = []
+    for error in e.errors(include_url=False):
+        error = {**error, "loc": ("body", *error["loc"])}
+        if isinstance(error.get("input"), bytes):
+            del error["input"]
+        errors.append(error)
+    return RequestValidationError(errors)
+
+async def binary_batch_predict(model: MagajiCoMLPredictor, body: bytes, content_type: str,
+                               deadline: Optional[float]) -> Response:
     try:
-        result = predictor.train(request.data, request.labels)
-        return {"success": True, **result}
+        features_matrix = decode_matrix(body, content_type, model.features_required)
+        async with admission.admit("batch", deadline):
+            probabilities = await worker_pools.run_inference(model.predict_proba_batch, features_matrix)
+        payload, media_type = encode_probabilities(probabilities, content_type)
+    except AdmissionRejected as e:
+        raise overloaded(e)
+    except UnsupportedMediaType as e:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(e))
+    except PoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    return Response(
+        content=payload,
+        media_type=media_type,
+        headers={"X-Model-Version": model.model_version, "X-Row-Count": str(len(probabilities))}
+    )
+
+STREAM_CHUNK_SIZE = int(os.getenv("ML_STREAM_CHUNK_SIZE", 1024))
+STREAM_MAX_LINE_BYTES = int(os.getenv("ML_STREAM_MAX_LINE_BYTES", 65536))
+
+@app.post("/predict/stream")
+async def stream_predict(request: Request, sport: Optional[str] = None, version: Optional[str] = None):
+    """
+    NDJSON in, NDJSON out: each line is a 7-feature array or a
+    {"features": [...], "match_context": {...}} object. Rows are predicted in
+    chunks of ML_STREAM_CHUNK_SIZE as they arrive, and results stream back in
+    input order, so memory stays flat whatever the input size. A malformed or
+    overlong row (over ML_STREAM_MAX_LINE_BYTES), or a chunk shed under
+    overload, yields {"index", "error"} lines instead of failing the stream.
+    """
+    model = await select_model(sport, version)
+    deadline = request_deadline(request)
+
+    async def results():
+        async for rows in iter_ndjson_chunks(
+            request.stream(), STREAM_CHUNK_SIZE, model.features_required, STREAM_MAX_LINE_BYTES
+        ):
+            features = [row.features for row in rows if row.error is None]
+            predictions = []
+            if features:
+                try:
+                    async with admission.admit("batch", deadline):
+                        predictions = await worker_pools.run_inference(model.predict_batch, features)
+                except (AdmissionRejected, PoolSaturated) as e:
+                    # Shed this chunk only; the stream carries on with the next one
+                    for row in rows:
+                        if row.error is None:
+                            row.error = f"Overloaded: {e}"
+            yield format_results(rows, predictions)
+
+    return RequestStreamingResponse(results(), media_type="application/x-ndjson")
+
+# Processes each search job fans candidate fits out to. By default the CPUs but one are
+# split between the training processes, since each may run a search at the same time
+SEARCH_WORKERS = int(os.getenv("ML_SEARCH_WORKERS", 0)) or max(
+    1, ((os.cpu_count() or 1) - 1) // worker_pools.training.workers
+)
+
+@app.post("/train", status_code=status.HTTP_202_ACCEPTED)
+async def train_model(request: TrainingRequest):
+    if not request.data or any(len(row) != predictor.features_required for row in request.data):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Training data must have {predictor.features_required} features per sample"
+        )
+    if len(request.labels) != len(request.data):
+        raise HTTPException(status_code=400, detail="Training data and labels must have the same length")
+
+    options: Dict[str, Any] = {}
+    if request.mode == "incremental":
+        sync_model()
+        if not predictor.supports_update():
+            raise HTTPException(
+                status_code=409,
+                detail="Incremental training needs an active sklearn model; run a full training first"
+            )
+        try:
+            check_incremental_labels(request.labels, predictor.classes)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        options = {"new_trees": request.new_trees, "max_trees": request.max_trees}
+    elif request.mode == "search":
+        options = {
+            "time_budget": request.time_budget_seconds,
+            "min_accuracy": request.min_accuracy,
+            "workers": SEARCH_WORKERS
+        }
+
+    try:
+        job = training_jobs.submit(request.data, request.labels, request.mode, options)
+    except PoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return {"success": True, **job.to_dict(), "status_url": f"/train/{job.id}"}
+
+@app.post("/train/dataset", status_code=status.HTTP_202_ACCEPTED)
+async def train_from_dataset(request: DatasetTrainingRequest):
+    try:
+        dataset = dataset_store.open(request.dataset, predictor.features_required)
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    options = {"chunk_size": request.chunk_size, "n_estimators": request.n_estimators, "max_depth": request.max_depth}
+    try:
+        job = training_jobs.submit_dataset(dataset, options)
+    except PoolSaturated as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return {"success": True, **job.to_dict(), "dataset": dataset.info(), "status_url": f"/train/{job.id}"}
+
+@app.get("/datasets")
+async def list_datasets():
+    return {"root": dataset_store.root, "datasets": dataset_store.list()}
+
+@app.get("/train/{job_id}")
+async def get_training_job(job_id: str):
+    job = training_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Training job {job_id} not found")
+    return job.to_dict()
+
+@app.post("/model/rollback")
+async def rollback_model():
+    try:
+        result = await worker_pools.run_inference(predictor.rollback)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    prediction_cache.clear()
+    return {"success": True, **result}
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     error_details = {
@@ -203,17 +707,3 @@ async def global_exception_handler(request: Request, exc: Exception):
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content=error_details
     )
-
-if __name__ == "__main__":
-    port = int(os.getenv("PORT", os.getenv("ML_PORT", 8000)))
-    environment = os.getenv("ENVIRONMENT", "development")
-
-    print(f"🚀 ML Service starting on port {port}")
-
-    uvicorn.run(
-        "api:app",
-        host="0.0.0.0",
-        port=port,
-        reload=(environment == "development"),
-        log_level="info"
-    )
@@ -0,0 +1,132 @@
+import asyncio
+import time
+from bisect import bisect_left
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+QUEUE_WAIT_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250)
+
+
+class PredictionCoalescer:
+    """
+    Collects concurrent single-row predictions and runs them as one batch.
+
+    A batch is flushed when window_ms has passed since its first request or when
+    max_batch_size requests are waiting, whichever comes first. Each caller gets
+    its own row of the vectorized result, so throughput goes up at the cost of at
+    most window_ms of added latency. run, if given, is awaited as
+    run(predict_batch, matrix) so the batch can execute off the event loop.
+    Call close() on shutdown to finish queued and running batches.
+    """
+
+    def __init__(self, predict_batch: Callable[[np.ndarray], List[Dict[str, Any]]],
+                 window_ms: float = 2.0, max_batch_size: int = 64,
+                 run: Optional[Callable[..., Awaitable[Any]]] = None):
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be positive")
+        self.predict_batch = predict_batch
+        self.run = run
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+
+        self._pending: List[Tuple[Sequence[float], asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.batches = 0
+        self.requests = 0
+        self.errors = 0
+        self._batch_size_counts = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+        self._queue_wait_counts = [0] * (len(QUEUE_WAIT_BUCKETS_MS) + 1)
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+
+    async def submit(self, features: Sequence[float]) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((features, future, time.perf_counter()))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        pending, self._pending = self._pending, []
+        if pending:
+            task = asyncio.ensure_future(self._run_batch(pending))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def close(self) -> None:
+        """Flush the queue and wait for every batch, e.g. before the inference pool shuts down"""
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _run_batch(self, pending: List[Tuple[Sequence[float], asyncio.Future, float]]) -> None:
+        started = time.perf_counter()
+        for _, _, enqueued_at in pending:
+            self._record_wait(started - enqueued_at)
+        self._record_batch(len(pending))
+
+        matrix = np.array([features for features, _, _ in pending], dtype=np.float64)
+        try:
+            if self.run is not None:
+                results = await self.run(self.predict_batch, matrix)
+            else:
+                results = self.predict_batch(matrix)
+        except Exception as e:
+            self.errors += 1
+            for _, future, _ in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(pending, results):
+            # The caller may have gone away (client disconnect) while queued
+            if not future.done():
+                future.set_result(result)
+
+    def _record_batch(self, size: int) -> None:
+        self.batches += 1
+        self.requests += size
+        self._batch_size_counts[bisect_left(BATCH_SIZE_BUCKETS, size)] += 1
+
+    def _record_wait(self, seconds: float) -> None:
+        wait_ms = seconds * 1000.0
+        self._queue_wait_total += wait_ms
+        self._queue_wait_max = max(self._queue_wait_max, wait_ms)
+        self._queue_wait_counts[bisect_left(QUEUE_WAIT_BUCKETS_MS, wait_ms)] += 1
+
+    @staticmethod
+    def _histogram(bounds: Sequence[float], counts: List[int]) -> Dict[str, int]:
+        # Per-bucket (non-cumulative) counts keyed by the bucket's upper bound
+        labels = [str(bound) for bound in bounds] + ["+Inf"]
+        return dict(zip(labels, counts))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "window_ms": self.window * 1000.0,
+            "max_batch_size": self.max_batch_size,
+            "batches": self.batches,
+            "requests": self.requests,
+            "errors": self.errors,
+            "pending": len(self._pending),
+            "mean_batch_size": round(self.requests / self.batches, 2) if self.batches else 0.0,
+            "batch_size_histogram": self._histogram(BATCH_SIZE_BUCKETS, self._batch_size_counts),
+            "queue_wait_ms": {
+                "mean": round(self._queue_wait_total / self.requests, 3) if self.requests else 0.0,
+                "max": round(self._queue_wait_max, 3),
+                "histogram": self._histogram(QUEUE_WAIT_BUCKETS_MS, self._queue_wait_counts)
+            }
+        }
@@ -0,0 +1,300 @@
+"""
+Throughput and latency benchmarks for the ML API.
+
+    python benchmark.py                                  # in-process, through ASGI
+    python benchmark.py --target uvicorn --workers 2     # against a local uvicorn server
+    python benchmark.py --output run.json --baseline previous.json
+
+Every scenario runs a fixed number of requests from a pool of concurrent
+clients and reports throughput plus p50/p95/p99 latency. The service runs with
+its model files in a temporary directory and rate limiting lifted, so a run
+never touches model_data.pkl. With --baseline the run is compared against an
+earlier JSON report and the exit code is 1 when any scenario's p99 or
+throughput regressed by more than --tolerance.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List
+
+import numpy as np
+
+try:
+    import httpx
+except ImportError:  # only needed to run the benchmarks
+    httpx = None
+
+from train_model import generate_training_data
+
+BATCH_SIZES = (16, 128, 1024)
+TRAINING_SAMPLES = 2000
+
+
+class Scenario:
+    __slots__ = ("name", "requests", "concurrency", "rows_per_request", "make_request")
+
+    def __init__(self, name: str, requests: int, concurrency: int,
+                 make_request: Callable[[Any, int], Awaitable[Any]], rows_per_request: int = 1):
+        self.name = name
+        self.requests = requests
+        self.concurrency = concurrency
+        self.rows_per_request = rows_per_request
+        self.make_request = make_request
+
+
+async def run_scenario(client: Any, scenario: Scenario) -> Dict[str, Any]:
+    """Closed loop: each client sends its next request as soon as the previous one returns"""
+    latencies: List[float] = []
+    status_counts: Dict[str, int] = {}
+    counter = iter(range(scenario.requests))
+
+    async def worker() -> None:
+        for i in counter:
+            started = time.perf_counter()
+            try:
+                response = await scenario.make_request(client, i)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - started)
+            status_counts[status] = status_counts.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(scenario.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    ok = status_counts.get("200", 0)
+    latency_ms = np.asarray(latencies) * 1000.0
+    return {
+        "requests": scenario.requests,
+        "concurrency": scenario.concurrency,
+        "rows_per_request": scenario.rows_per_request,
+        "elapsed_s": round(elapsed, 4),
+        "status_counts": status_counts,
+        "error_rate": round(1.0 - ok / scenario.requests, 4),
+        "throughput_rps": round(ok / elapsed, 2),
+        "rows_per_s": round(ok * scenario.rows_per_request / elapsed, 2),
+        "latency_ms": {
+            "mean": round(float(latency_ms.mean()), 3),
+            "p50": round(float(np.percentile(latency_ms, 50)), 3),
+            "p95": round(float(np.percentile(latency_ms, 95)), 3),
+            "p99": round(float(np.percentile(latency_ms, 99)), 3),
+            "max": round(float(latency_ms.max()), 3)
+        }
+    }
+
+
+def feature_rows(count: int, seed: int) -> List[List[float]]:
+    # Same ranges as the training data, so predictions exercise real tree paths
+    rng = np.random.default_rng(seed)
+    low = np.array([0.3, 0.3, 0.5, 0.2, 0.2, 0.3, 0.4])
+    high = np.array([1.0, 1.0, 0.8, 1.0, 1.0, 0.7, 1.0])
+    return (low + rng.random((count, 7)) * (high - low)).tolist()
+
+
+def predict_scenario(name: str, requests: int, concurrency: int, rows: List[List[float]]) -> Scenario:
+    async def make_request(client: Any, i: int) -> Any:
+        return await client.post("/predict", json={"features": rows[i % len(rows)]})
+
+    return Scenario(name, requests, concurrency, make_request)
+
+
+def batch_scenario(batch_size: int, requests: int, concurrency: int) -> Scenario:
+    payload = {"predictions": [{"features": row} for row in feature_rows(batch_size, seed=batch_size)]}
+
+    async def make_request(client: Any, i: int) -> Any:
+        return await client.post("/predict/batch", json=payload)
+
+    return Scenario(f"batch_{batch_size}", requests, concurrency, make_request, rows_per_request=batch_size)
+
+
+async def start_training(client: Any) -> str:
+    X, y = generate_training_data(TRAINING_SAMPLES)
+    response = await client.post("/train", json={"data": X.tolist(), "labels": y.tolist()})
+    response.raise_for_status()
+    return response.json()["job_id"]
+
+
+async def wait_for_training(client: Any, job_id: str, timeout: float = 300.0) -> Dict[str, Any]:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = (await client.get(f"/train/{job_id}")).json()
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        await asyncio.sleep(0.1)
+    raise TimeoutError(f"Training job {job_id} did not finish within {timeout}s")
+
+
+async def run_suite(client: Any, requests: int, concurrency: int,
+                    log: Callable[[str], None]) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+
+    async def run(scenario: Scenario) -> None:
+        results[scenario.name] = await run_scenario(client, scenario)
+        stats = results[scenario.name]
+        log(f"{scenario.name:<24} {stats['throughput_rps']:>10.1f} req/s  "
+            f"p50 {stats['latency_ms']['p50']:>8.2f}ms  p95 {stats['latency_ms']['p95']:>8.2f}ms  "
+            f"p99 {stats['latency_ms']['p99']:>8.2f}ms  errors {stats['error_rate']:.1%}")
+
+    # No model exists yet in the temporary model directory
+    await run(predict_scenario("fallback_predict", requests, concurrency, feature_rows(requests, seed=1)))
+
+    job = await wait_for_training(client, await start_training(client))
+    if job["status"] != "succeeded":
+        raise RuntimeError(f"Training failed: {job.get('error')}")
+
+    # Unique rows miss the prediction cache; a handful of repeated rows hit it
+    await run(predict_scenario("predict_cold", requests, concurrency, feature_rows(requests, seed=2)))
+    await run(predict_scenario("predict_cached", requests, concurrency, feature_rows(8, seed=3)))
+    for batch_size in BATCH_SIZES:
+        await run(batch_scenario(batch_size, max(10, requests // max(1, batch_size // 16)), concurrency))
+
+    # Inference latency while a retrain runs in the training process
+    training = asyncio.ensure_future(start_training(client))
+    await run(predict_scenario("predict_during_train", requests, concurrency, feature_rows(requests, seed=4)))
+    await wait_for_training(client, await training)
+    return results
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def service_env(model_dir: str) -> Dict[str, str]:
+    return {
+        "ML_MODEL_PATH": os.path.join(model_dir, "model_data.pkl"),
+        "ML_RATE_LIMIT_PER_MINUTE": str(10 ** 9),
+        "ML_RATE_LIMIT_ROUTES": "",
+        "ENVIRONMENT": "production"
+    }
+
+
+async def run_asgi(args: argparse.Namespace, log: Callable[[str], None]) -> Dict[str, Dict[str, Any]]:
+    with tempfile.TemporaryDirectory() as model_dir:
+        os.environ.update(service_env(model_dir))
+        import api
+
+        transport = httpx.ASGITransport(app=api.app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=60.0) as client:
+                return await run_suite(client, args.requests, args.concurrency, log)
+        finally:
+            api.worker_pools.shutdown()
+
+
+async def run_uvicorn(args: argparse.Namespace, log: Callable[[str], None]) -> Dict[str, Dict[str, Any]]:
+    port = free_port()
+    with tempfile.TemporaryDirectory() as model_dir:
+        env = {**os.environ, **service_env(model_dir), "ML_PORT": str(port), "ML_WORKERS": str(args.workers)}
+        server = subprocess.Popen(
+            [sys.executable, "api.py"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        try:
+            limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60.0, limits=limits) as client:
+                await wait_for_server(client, server)
+                return await run_suite(client, args.requests, args.concurrency, log)
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+
+async def wait_for_server(client: Any, server: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise TimeoutError("uvicorn did not become healthy")
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            tolerance: float, log: Callable[[str], None]) -> List[str]:
+    """Names of scenarios whose p99 or throughput regressed by more than tolerance"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        p99_change = current["latency_ms"]["p99"] / max(previous["latency_ms"]["p99"], 1e-9) - 1.0
+        throughput_change = current["throughput_rps"] / max(previous["throughput_rps"], 1e-9) - 1.0
+        regressed = p99_change > tolerance or throughput_change < -tolerance
+        if regressed:
+            regressions.append(name)
+        log(f"{name:<24} p99 {p99_change:+7.1%}  throughput {throughput_change:+7.1%}"
+            f"{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the ML prediction API")
+    parser.add_argument("--target", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes (--target uvicorn)")
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--baseline", help="JSON report of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative regression (default: 0.2)")
+    args = parser.parse_args()
+
+    if httpx is None:
+        print("The httpx package is required to run the benchmarks")
+        return 2
+
+    # train_model configures INFO logging on import; keep per-request client logs out
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    log = lambda line: print(line, flush=True)
+    runner = run_asgi if args.target == "asgi" else run_uvicorn
+    started_at = datetime.now().isoformat()
+    results = asyncio.run(runner(args, log))
+
+    report = {
+        "meta": {
+            "started_at": started_at,
+            "target": args.target,
+            "workers": args.workers if args.target == "uvicorn" else 1,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        },
+        "scenarios": results
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        log(f"✅ Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["scenarios"]
+        regressions = compare(results, baseline, args.tolerance, log)
+        if regressions:
+            log(f"❌ Regressed: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
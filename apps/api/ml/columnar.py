@@ -0,0 +1,79 @@
+from typing import Tuple
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+except ImportError:  # optional: only needed for Arrow IPC batches
+    pa = None
+
+FLOAT32_MEDIA_TYPE = "application/vnd.magajico.float32"
+FLOAT64_MEDIA_TYPE = "application/vnd.magajico.float64"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# Packed row-major little-endian matrices
+PACKED_DTYPES = {
+    FLOAT32_MEDIA_TYPE: np.dtype("<f4"),
+    FLOAT64_MEDIA_TYPE: np.dtype("<f8"),
+}
+
+PROBABILITY_COLUMNS = ("home", "draw", "away")
+
+
+class UnsupportedMediaType(ValueError):
+    pass
+
+
+def media_type(content_type: str) -> str:
+    return content_type.split(";", 1)[0].strip().lower()
+
+
+def is_binary(content_type: str) -> bool:
+    mtype = media_type(content_type)
+    return mtype in PACKED_DTYPES or mtype == ARROW_MEDIA_TYPE
+
+
+def decode_matrix(body: bytes, content_type: str, n_features: int) -> np.ndarray:
+    """
+    (N, n_features) feature matrix from a binary request body.
+    Packed buffers are viewed in place with np.frombuffer, not copied; Arrow
+    record batches must have n_features numeric columns in feature order.
+    """
+    mtype = media_type(content_type)
+    if mtype in PACKED_DTYPES:
+        dtype = PACKED_DTYPES[mtype]
+        row_bytes = dtype.itemsize * n_features
+        if len(body) % row_bytes:
+            raise ValueError(f"Body length {len(body)} is not a multiple of {row_bytes} bytes per row")
+        return np.frombuffer(body, dtype=dtype).reshape(-1, n_features)
+
+    if mtype == ARROW_MEDIA_TYPE:
+        if pa is None:
+            raise UnsupportedMediaType("The pyarrow package is required for Arrow IPC batches")
+        table = pa.ipc.open_stream(body).read_all()
+        if table.num_columns != n_features:
+            raise ValueError(f"Expected {n_features} columns, got {table.num_columns}")
+        if table.num_rows == 0:
+            return np.empty((0, n_features), dtype=np.float64)
+        return np.column_stack([column.to_numpy() for column in table.columns]).astype(np.float64, copy=False)
+
+    raise UnsupportedMediaType(f"Unsupported content type: {content_type}")
+
+
+def encode_probabilities(probabilities: np.ndarray, content_type: str) -> Tuple[bytes, str]:
+    """
+    (N, 3) home/draw/away probabilities in the request's format: the same
+    packed dtype, or an Arrow record batch with home, draw and away columns.
+    """
+    mtype = media_type(content_type)
+    if mtype in PACKED_DTYPES:
+        return probabilities.astype(PACKED_DTYPES[mtype], copy=False).tobytes(), mtype
+
+    batch = pa.record_batch(
+        [pa.array(probabilities[:, i]) for i in range(len(PROBABILITY_COLUMNS))],
+        names=list(PROBABILITY_COLUMNS)
+    )
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes(), ARROW_MEDIA_TYPE
@@ -0,0 +1,190 @@
+import glob
+import os
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from model_registry import version_key
+
+DATASET_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+
+
+class Dataset:
+    """
+    An on-disk training set: one or more (features, labels) .npy part pairs.
+    A directory holds either features.npy + labels.npy, or chunked parts named
+    features_<n>.npy + labels_<n>.npy that are read in numeric order. Parts are
+    memory-mapped, so opening a dataset reads nothing but the .npy headers.
+    """
+
+    def __init__(self, dataset_id: str, parts: List[Tuple[str, str]], rows: int):
+        self.id = dataset_id
+        self.parts = parts
+        self.rows = rows
+
+    @classmethod
+    def open(cls, directory: str, features_required: int = 7) -> "Dataset":
+        # Natural order, so features_10.npy comes after features_9.npy
+        feature_files = sorted(
+            glob.glob(os.path.join(directory, "features*.npy")), key=lambda path: version_key(os.path.basename(path))
+        )
+        if not feature_files:
+            raise FileNotFoundError(f"No features*.npy files in {directory}")
+
+        parts = []
+        rows = 0
+        for features_path in feature_files:
+            suffix = os.path.basename(features_path)[len("features"):]
+            labels_path = os.path.join(directory, "labels" + suffix)
+            if not os.path.exists(labels_path):
+                raise FileNotFoundError(f"{features_path} has no matching labels{suffix}")
+
+            features = np.load(features_path, mmap_mode="r")
+            labels = np.load(labels_path, mmap_mode="r")
+            if features.ndim != 2 or features.shape[1] != features_required:
+                raise ValueError(f"{features_path} must have shape (N, {features_required}), got {features.shape}")
+            if labels.shape != (features.shape[0],):
+                raise ValueError(f"{labels_path} must have shape ({features.shape[0]},), got {labels.shape}")
+            parts.append((features_path, labels_path))
+            rows += features.shape[0]
+
+        return cls(os.path.basename(os.path.normpath(directory)), parts, rows)
+
+    def iter_chunks(self, chunk_size: int, start: int = 0,
+                    stop: Optional[int] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        (features, labels) chunks of at most chunk_size rows covering rows
+        [start, stop) across all parts. Only the current chunk is copied out of
+        the memory maps.
+        """
+        stop = self.rows if stop is None else stop
+        offset = 0
+        for features_path, labels_path in self.parts:
+            features = np.load(features_path, mmap_mode="r")
+            labels = np.load(labels_path, mmap_mode="r")
+            part_rows = features.shape[0]
+            begin, end = max(start, offset) - offset, min(stop, offset + part_rows) - offset
+            for chunk_start in range(begin, end, chunk_size):
+                chunk_stop = min(chunk_start + chunk_size, end)
+                yield (np.asarray(features[chunk_start:chunk_stop], dtype=np.float64),
+                       np.asarray(labels[chunk_start:chunk_stop]))
+            offset += part_rows
+            del features, labels
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "rows": self.rows,
+            "parts": len(self.parts),
+            "bytes": sum(os.path.getsize(f) + os.path.getsize(l) for f, l in self.parts)
+        }
+
+
+class DatasetStore:
+    """Datasets live in subdirectories of root and are addressed by directory name"""
+
+    def __init__(self, root: str):
+        self.root = os.path.realpath(root)
+
+    def resolve(self, dataset: str) -> str:
+        """
+        Directory for a dataset ID, or for a path inside root. Anything that
+        resolves outside root is refused, so callers cannot read arbitrary files.
+        """
+        if DATASET_ID_PATTERN.match(dataset):
+            directory = os.path.join(self.root, dataset)
+        else:
+            directory = os.path.realpath(dataset if os.path.isabs(dataset) else os.path.join(self.root, dataset))
+        if os.path.commonpath([self.root, os.path.realpath(directory)]) != self.root:
+            raise PermissionError(f"Dataset {dataset} is outside {self.root}")
+        if not os.path.isdir(directory):
+            raise FileNotFoundError(f"Dataset {dataset} not found")
+        return directory
+
+    def open(self, dataset: str, features_required: int = 7) -> Dataset:
+        return Dataset.open(self.resolve(dataset), features_required)
+
+    def list(self) -> List[Dict[str, Any]]:
+        datasets = []
+        if not os.path.isdir(self.root):
+            return datasets
+        for name in sorted(os.listdir(self.root)):
+            directory = os.path.join(self.root, name)
+            if os.path.isdir(directory) and glob.glob(os.path.join(directory, "features*.npy")):
+                try:
+                    datasets.append(Dataset.open(directory).info())
+                except (OSError, ValueError) as e:
+                    datasets.append({"id": name, "error": str(e)})
+        return datasets
+
+
+def fit_forest_out_of_core(dataset: Dataset, chunk_size: int = 1_000_000, n_estimators: int = 100,
+                           max_depth: Optional[int] = 10, holdout_fraction: float = 0.1,
+                           max_holdout_rows: int = 200_000) -> Dict[str, Any]:
+    """
+    Fit scaler + forest on a dataset too large for memory, one chunk at a time.
+
+    The last holdout_fraction of rows (at most max_holdout_rows) is held out,
+    which for a time-ordered match history scores the model on its most recent
+    results. Pass 1 streams the training rows through StandardScaler.partial_fit
+    and collects the label set. Chunks missing a class are skipped and counted;
+    pass 2 splits exactly n_estimators trees over the rest (the first
+    n_estimators % k chunks get one extra) and grows them with warm_start, so
+    each tree sees one chunk, as in bagging over subsamples. Peak memory
+    is about one chunk plus the forest. Returns the fit_forest result shape.
+    Module-level so it can run in a worker process.
+    """
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import StandardScaler
+
+    holdout_rows = min(max_holdout_rows, int(dataset.rows * holdout_fraction))
+    train_rows = dataset.rows - holdout_rows
+    if train_rows <= 0 or holdout_rows <= 0:
+        raise ValueError(f"Dataset {dataset.id} has too few rows ({dataset.rows}) to train and score")
+
+    scaler = StandardScaler()
+    classes = set()
+    chunk_classes = []
+    for X, y in dataset.iter_chunks(chunk_size, 0, train_rows):
+        scaler.partial_fit(X)
+        chunk_classes.append(set(np.unique(y).tolist()))
+        classes.update(chunk_classes[-1])
+
+    chunks = len(chunk_classes)
+    usable = [labels == classes for labels in chunk_classes]
+    used_chunks = sum(usable)
+    if used_chunks == 0:
+        raise ValueError(f"No chunk of {chunk_size} rows contains every class {sorted(classes)}")
+    trees_per_chunk, extra_trees = divmod(n_estimators, used_chunks)
+
+    model = RandomForestClassifier(n_estimators=0, max_depth=max_depth, warm_start=True, random_state=42)
+    used = 0
+    for (X, y), use in zip(dataset.iter_chunks(chunk_size, 0, train_rows), usable):
+        if not use:
+            continue
+        trees = trees_per_chunk + (1 if used < extra_trees else 0)
+        used += 1
+        if trees == 0:
+            continue
+        model.set_params(n_estimators=model.n_estimators + trees)
+        model.fit(scaler.transform(X), y)
+
+    correct = 0
+    for X, y in dataset.iter_chunks(chunk_size, train_rows):
+        correct += int((model.predict(scaler.transform(X)) == y).sum())
+
+    return {
+        "model": model,
+        "scaler": scaler,
+        "accuracy": correct / holdout_rows,
+        "dataset": {
+            **dataset.info(),
+            "train_rows": train_rows,
+            "holdout_rows": holdout_rows,
+            "chunks": chunks,
+            "trees_per_chunk": trees_per_chunk,
+            "extra_tree_chunks": extra_trees,
+            "skipped_chunks": chunks - used_chunks
+        }
+    }
@@ -0,0 +1,108 @@
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class PoolSaturated(Exception):
+    """Raised when a pool already has as much work in flight as it is allowed to queue"""
+
+
+class _BoundedPool:
+    def __init__(self, name: str, executor: Executor, workers: int, queue_limit: int):
+        self.name = name
+        self.executor = executor
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.queue_limit
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            if self.in_flight >= self.capacity:
+                self.rejected += 1
+                raise PoolSaturated(f"{self.name} pool is saturated ({self.in_flight} jobs in flight)")
+            self.in_flight += 1
+
+        try:
+            future = self.executor.submit(functools.partial(fn, *args))
+        except BaseException:
+            self._done(None)
+            raise
+        # A cancelled caller stops waiting, but the job holds its slot until the executor finishes or drops it
+        future.add_done_callback(self._done)
+        return await asyncio.wrap_future(future)
+
+    def _done(self, future: Optional[Future]) -> None:
+        # Runs on the worker (or cancelling) thread, hence the lock
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queue_limit": self.queue_limit,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected
+        }
+
+
+class WorkerPools:
+    """
+    Keeps CPU-bound work off the asyncio event loop.
+    Inference runs on a thread pool (NumPy and sklearn release the GIL while they
+    work); training runs in a separate process pool so a long fit cannot starve
+    request handling. Both pools reject work beyond workers + queue_limit.
+    """
+
+    def __init__(self, inference_workers: int = 4, inference_queue_limit: int = 100,
+                 training_workers: int = 1, training_queue_limit: int = 2):
+        self.inference = _BoundedPool(
+            "inference",
+            ThreadPoolExecutor(max_workers=inference_workers, thread_name_prefix="ml-inference"),
+            inference_workers,
+            inference_queue_limit
+        )
+        self.training = _BoundedPool(
+            "training",
+            ProcessPoolExecutor(max_workers=training_workers),
+            training_workers,
+            training_queue_limit
+        )
+
+    @classmethod
+    def from_env(cls) -> "WorkerPools":
+        return cls(
+            inference_workers=int(os.getenv("ML_INFERENCE_THREADS", min(4, os.cpu_count() or 1))),
+            inference_queue_limit=int(os.getenv("ML_INFERENCE_QUEUE_LIMIT", 100)),
+            training_workers=int(os.getenv("ML_TRAINING_PROCESSES", 1)),
+            training_queue_limit=int(os.getenv("ML_TRAINING_QUEUE_LIMIT", 2))
+        )
+
+    async def run_inference(self, fn: Callable[..., Any], *args: Any) -> Any:
+        return await self.inference.run(fn, *args)
+
+    async def run_training(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """fn and args must be picklable: they are sent to a worker process"""
+        return await self.training.run(fn, *args)
+
+    def shutdown(self) -> None:
+        self.inference.executor.shutdown(wait=False, cancel_futures=True)
+        # Waits for a running fit, so the training process exits cleanly instead of leaking its semaphores
+        self.training.executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "inference": self.inference.stats(),
+            "training": self.training.stats()
+        }
@@ -0,0 +1,112 @@
+"""
+Pickle-free, memory-mappable model artifact.
+
+Layout (all integers little-endian):
+    8 bytes   magic b"MGJFRST1"
+    8 bytes   header length H
+    H bytes   UTF-8 JSON header, space padded so arrays start 64-byte aligned
+    ...       raw C-ordered arrays at the offsets listed in the header
+
+Loading maps the file read-only and wraps each array with np.frombuffer, so
+startup does no parsing beyond the header and every worker process shares the
+same physical pages through the OS page cache.
+"""
+import json
+import mmap
+import os
+import sys
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from tree_engine import CompiledForest
+
+ARTIFACT_MAGIC = b"MGJFRST1"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+ENGINE_ARRAYS = ("mean", "scale", "feature", "threshold", "children", "values", "roots", "classes")
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def save_artifact(path: str, engine: CompiledForest, metadata: Optional[Dict[str, Any]] = None) -> None:
+    """Write engine tables to path atomically (temporary file + rename)"""
+    arrays = {}
+    for name in ENGINE_ARRAYS:
+        array = np.ascontiguousarray(getattr(engine, name))
+        arrays[name] = array.astype(array.dtype.newbyteorder("<"), copy=False)
+
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        offset = _align(offset)
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += array.nbytes
+
+    header = {
+        "format_version": FORMAT_VERSION,
+        "created_at": time.time(),
+        "max_depth": engine.max_depth,
+        "metadata": metadata or {},
+        "arrays": layout
+    }
+    header_bytes = json.dumps(header).encode("utf-8")
+    data_start = _align(16 + len(header_bytes))
+    header_bytes = header_bytes.ljust(data_start - 16, b" ")
+
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(ARTIFACT_MAGIC)
+        f.write(len(header_bytes).to_bytes(8, "little"))
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(array.tobytes())
+    os.replace(tmp_path, path)
+
+
+def load_artifact(path: str) -> Tuple[CompiledForest, Dict[str, Any]]:
+    """Map an artifact read-only and return its engine and metadata"""
+    with open(path, "rb") as f:
+        if f.read(8) != ARTIFACT_MAGIC:
+            raise ValueError(f"{path} is not a MagajiCo model artifact")
+        header_length = int.from_bytes(f.read(8), "little")
+        header = json.loads(f.read(header_length).decode("utf-8"))
+        # The mapping stays valid after the file object is closed
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if header.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported artifact format version {header.get('format_version')}")
+
+    data_start = 16 + header_length
+    arrays = {}
+    for name in ENGINE_ARRAYS:
+        spec = header["arrays"][name]
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        array = np.frombuffer(buffer, dtype=dtype, count=count, offset=data_start + spec["offset"])
+        arrays[name] = array.reshape(spec["shape"])
+
+    engine = CompiledForest(max_depth=header["max_depth"], **arrays)
+    return engine, header["metadata"]
+
+
+if __name__ == "__main__":
+    # python model_artifact.py model_data.pkl model_data.forest
+    import pickle
+
+    if len(sys.argv) != 3:
+        print("Usage: python model_artifact.py <model_data.pkl> <output.forest>")
+        sys.exit(1)
+
+    with open(sys.argv[1], "rb") as f:
+        saved = pickle.load(f)
+    forest = CompiledForest.from_sklearn(saved["model"], saved["scaler"])
+    save_artifact(sys.argv[2], forest, {
+        "accuracy": saved.get("accuracy"),
+        "version": saved.get("version")
+    })
+    print(f"✅ Exported {sys.argv[1]} to {sys.argv[2]}")
@@ -0,0 +1,195 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+MODEL_EXTENSIONS = (".forest", ".pkl")
+NAME_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+
+
+class ModelNotFound(LookupError):
+    pass
+
+
+class RegistryEntry:
+    __slots__ = ("id", "sport", "version", "model_path", "artifact_path")
+
+    def __init__(self, sport: str, version: str, directory: str):
+        self.id = f"{sport}/{version}"
+        self.sport = sport
+        self.version = version
+        self.model_path = os.path.join(directory, version + ".pkl")
+        self.artifact_path = os.path.join(directory, version + ".forest")
+
+    def disk_bytes(self) -> int:
+        return sum(os.path.getsize(p) for p in (self.model_path, self.artifact_path) if os.path.exists(p))
+
+
+def version_key(version: str) -> List[Any]:
+    """Natural sort key, so v10 comes after v9 and 2026-10 after 2026-9"""
+    return [(0, int(part)) if part.isdigit() else (1, part) for part in re.split(r"(\d+)", version) if part]
+
+
+class ModelRegistry:
+    """
+    Versioned models laid out as <root>/<sport>/<version>.forest (or .pkl),
+    e.g. models/premier-league/2026-10.forest. A model is loaded on first use
+    through load(entry) and kept in an LRU; once the loaded models' size(model)
+    exceeds memory_budget bytes the least recently used ones are dropped.
+    Requests that already hold a model keep using it after eviction.
+    Versions are treated as immutable: publish a new version instead of
+    overwriting a loaded one. The index is rescanned every refresh_interval
+    seconds, and when a lookup misses unless it was rescanned within the last
+    miss_refresh_interval seconds, so new versions are picked up without a
+    restart and a stream of unknown IDs cannot rescan on every request.
+    """
+
+    def __init__(self, root: str, load: Callable[[RegistryEntry], Any], size: Callable[[Any], int],
+                 memory_budget: int = 512 * 1024 * 1024, refresh_interval: float = 30.0,
+                 miss_refresh_interval: float = 1.0):
+        self.root = root
+        self.load = load
+        self.size = size
+        self.memory_budget = memory_budget
+        self.refresh_interval = refresh_interval
+        self.miss_refresh_interval = miss_refresh_interval
+        self._refreshed_at = 0.0
+
+        self._index: Dict[str, RegistryEntry] = {}
+        self._latest: Dict[str, str] = {}
+        self._loaded: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+        self.load_seconds = 0.0
+        self.refresh()
+
+    def refresh(self) -> None:
+        index = {}
+        if os.path.isdir(self.root):
+            for sport in sorted(os.listdir(self.root)):
+                directory = os.path.join(self.root, sport)
+                if not NAME_PATTERN.match(sport) or not os.path.isdir(directory):
+                    continue
+                for filename in os.listdir(directory):
+                    version, extension = os.path.splitext(filename)
+                    if extension in MODEL_EXTENSIONS and NAME_PATTERN.match(version):
+                        entry = RegistryEntry(sport, version, directory)
+                        index[entry.id] = entry
+
+        latest: Dict[str, str] = {}
+        for entry in sorted(index.values(), key=lambda e: version_key(e.version)):
+            latest[entry.sport] = entry.id
+        with self._lock:
+            self._index, self._latest = index, latest
+            self._refreshed_at = time.monotonic()
+
+    def resolve(self, sport: Optional[str] = None, version: Optional[str] = None) -> str:
+        """
+        Model ID for a request: the latest version of sport, or a given version
+        ("<sport>/<version>", or a bare version that is unique or paired with sport)
+        """
+        if time.monotonic() - self._refreshed_at > self.refresh_interval:
+            self.refresh()
+        model_id = self._find(sport, version)
+        if model_id is None and time.monotonic() - self._refreshed_at > self.miss_refresh_interval:
+            self.refresh()
+            model_id = self._find(sport, version)
+        if model_id is None:
+            wanted = " ".join(f"{k}={v}" for k, v in (("sport", sport), ("version", version)) if v)
+            raise ModelNotFound(f"No registered model for {wanted}")
+        return model_id
+
+    def _find(self, sport: Optional[str], version: Optional[str]) -> Optional[str]:
+        if version is None:
+            return self._latest.get(sport)
+        if "/" in version:
+            model_id = version
+        elif sport is not None:
+            model_id = f"{sport}/{version}"
+        else:
+            matches = [entry.id for entry in self._index.values() if entry.version == version]
+            model_id = matches[0] if len(matches) == 1 else None
+        entry = self._index.get(model_id)
+        if entry is None or (sport is not None and entry.sport != sport):
+            return None
+        return model_id
+
+    def peek(self, model_id: str) -> Optional[Any]:
+        """The model if it is loaded, without loading it; cheap enough for the event loop"""
+        with self._lock:
+            model = self._loaded.get(model_id)
+            if model is not None:
+                self._loaded.move_to_end(model_id)
+                self.hits += 1
+            return model
+
+    def get(self, model_id: str) -> Any:
+        """The model, loading it first if needed; concurrent callers share one load"""
+        model = self.peek(model_id)
+        if model is not None:
+            return model
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(model_id, threading.Lock())
+        with load_lock:
+            model = self.peek(model_id)
+            if model is not None:
+                return model
+
+            entry = self._index.get(model_id)
+            if entry is None:
+                raise ModelNotFound(f"No registered model {model_id}")
+            started = time.perf_counter()
+            model = self.load(entry)
+            size = self.size(model)
+
+            with self._lock:
+                self.loads += 1
+                self.load_seconds += time.perf_counter() - started
+                self._loaded[model_id] = model
+                self._sizes[model_id] = size
+                self._evict()
+                self._load_locks.pop(model_id, None)
+        return model
+
+    def _evict(self) -> None:
+        # The newest model always stays, even when it alone exceeds the budget
+        while len(self._loaded) > 1 and sum(self._sizes.values()) > self.memory_budget:
+            model_id, _ = self._loaded.popitem(last=False)
+            del self._sizes[model_id]
+            self.evictions += 1
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            entries = sorted(self._index.values(), key=lambda e: (e.sport, version_key(e.version)))
+            return [
+                {
+                    "id": entry.id,
+                    "sport": entry.sport,
+                    "version": entry.version,
+                    "latest": self._latest.get(entry.sport) == entry.id,
+                    "loaded": entry.id in self._loaded,
+                    "disk_bytes": entry.disk_bytes()
+                }
+                for entry in entries
+            ]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "registered": len(self._index),
+                "loaded": list(self._loaded),
+                "memory_bytes": sum(self._sizes.values()),
+                "memory_budget_bytes": self.memory_budget,
+                "hits": self.hits,
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "load_seconds": round(self.load_seconds, 4)
+            }
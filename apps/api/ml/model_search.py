@@ -0,0 +1,213 @@
+import multiprocessing
+import os
+import queue
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from tree_engine import CompiledForest
+
+N_ESTIMATORS_GRID = (25, 50, 100, 200)
+MAX_DEPTH_GRID = (6, 8, 10, 12, None)
+# Each successive-halving rung refits the best 1/ETA candidates on ETA times the data
+ETA = 3
+MIN_RUNG_SAMPLES = 500
+LATENCY_PROBE_ROWS = 200
+
+
+def _fit_candidate(params: Dict[str, Any], X_train: np.ndarray, y_train: np.ndarray,
+                   X_val: np.ndarray, y_val: np.ndarray) -> Dict[str, Any]:
+    from sklearn.ensemble import RandomForestClassifier
+
+    started = time.perf_counter()
+    model = RandomForestClassifier(random_state=42, **params)
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - started
+    depth = max(estimator.tree_.max_depth for estimator in model.estimators_)
+    return {
+        "params": params,
+        "model": model,
+        "accuracy": float((model.predict(X_val) == y_val).mean()),
+        "fit_seconds": fit_seconds,
+        # The compiled engine walks depth levels for every tree
+        "walk_cost": params["n_estimators"] * depth
+    }
+
+
+def _survivors(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Top 1/ETA by accuracy, plus every result no other beats on both accuracy and walk cost"""
+    ranked = sorted(results, key=lambda r: r["accuracy"], reverse=True)
+    keep = ranked[:max(1, len(ranked) // ETA)]
+    for result in ranked:
+        dominated = any(
+            other["accuracy"] >= result["accuracy"] and other["walk_cost"] <= result["walk_cost"]
+            and (other["accuracy"] > result["accuracy"] or other["walk_cost"] < result["walk_cost"])
+            for other in ranked
+        )
+        if not dominated and result not in keep:
+            keep.append(result)
+    return keep
+
+
+def measure_candidate(model: Any, scaler: Any, X_probe: np.ndarray) -> Dict[str, float]:
+    """Serving cost of a fitted forest: compiled single-row latency and node-table size"""
+    engine = CompiledForest.from_sklearn(model, scaler)
+    engine.predict_proba_row(X_probe[0])
+    timings = []
+    for row in X_probe:
+        started = time.perf_counter()
+        engine.predict_proba_row(row)
+        timings.append(time.perf_counter() - started)
+    return {
+        "latency_p50_us": round(float(np.percentile(timings, 50)) * 1e6, 2),
+        "size_bytes": engine.info()["nbytes"]
+    }
+
+
+def pareto_front(candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Candidates no other candidate beats on accuracy, latency and size at once"""
+    def dominates(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+        no_worse = (a["accuracy"] >= b["accuracy"] and a["latency_p50_us"] <= b["latency_p50_us"]
+                    and a["size_bytes"] <= b["size_bytes"])
+        better = (a["accuracy"] > b["accuracy"] or a["latency_p50_us"] < b["latency_p50_us"]
+                  or a["size_bytes"] < b["size_bytes"])
+        return no_worse and better
+
+    front = [c for c in candidates if not any(dominates(other, c) for other in candidates)]
+    return sorted(front, key=lambda c: c["latency_p50_us"])
+
+
+def select_candidate(front: List[Dict[str, Any]], min_accuracy: Optional[float]) -> Dict[str, Any]:
+    """Fastest front member meeting min_accuracy, else the most accurate one"""
+    if min_accuracy is not None:
+        eligible = [c for c in front if c["accuracy"] >= min_accuracy]
+        if eligible:
+            return min(eligible, key=lambda c: (c["latency_p50_us"], c["size_bytes"]))
+    return max(front, key=lambda c: (c["accuracy"], -c["latency_p50_us"]))
+
+
+def search_forest(data: List[List[float]], labels: List[int], time_budget: float = 60.0,
+                  min_accuracy: Optional[float] = None, workers: Optional[int] = None,
+                  n_estimators_grid: Sequence[int] = N_ESTIMATORS_GRID,
+                  max_depth_grid: Sequence[Optional[int]] = MAX_DEPTH_GRID,
+                  features_required: int = 7) -> Dict[str, Any]:
+    """
+    Successive-halving search over forest size and depth within time_budget seconds.
+
+    Every grid candidate is first fitted on a small sample of the training
+    split; each rung keeps the best 1/ETA by validation accuracy, plus any
+    candidate that is both cheaper to evaluate and no less accurate than the
+    rest, and refits them on ETA times more data, until the full split is used
+    or one candidate is left. Fits run in parallel across workers processes
+    (default: all CPUs but one). When the budget runs out, the pool is
+    terminated, so no fit outlives the search, and the last finished rung is used. The candidates of that rung are timed
+    through the compiled engine, and the model chosen from their Pareto front
+    (accuracy vs. latency vs. size) is returned as fit_forest would, with the
+    search report under "search". Module-level so it can run in a worker process.
+    """
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+
+    if len(data) == 0 or len(data[0]) != features_required:
+        raise ValueError(f"Training data must have {features_required} features per sample")
+
+    started = time.monotonic()
+    deadline = started + time_budget
+
+    X = np.array(data)
+    y = np.array(labels)
+    X_train, X_val, y_train, y_val = train_test_split(X, y, test_size=0.25, random_state=42)
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    X_val_scaled = scaler.transform(X_val)
+
+    # Rows are shuffled by train_test_split, so each rung trains on a prefix
+    rungs = []
+    samples = len(X_train)
+    while samples > MIN_RUNG_SAMPLES:
+        rungs.insert(0, samples)
+        samples //= ETA
+    rungs = rungs or [len(X_train)]
+
+    candidates = [
+        {"n_estimators": n_estimators, "max_depth": max_depth}
+        for n_estimators in n_estimators_grid for max_depth in max_depth_grid
+    ]
+    history = []
+    finished: List[Dict[str, Any]] = []
+    timed_out = False
+
+    workers = min(workers or max(1, (os.cpu_count() or 1) - 1), len(candidates))
+    pool = multiprocessing.Pool(workers)
+    try:
+        for rung, samples in enumerate(rungs):
+            if time.monotonic() >= deadline:
+                timed_out = True
+                break
+            outcomes: "queue.Queue[Any]" = queue.Queue()
+            for params in candidates:
+                pool.apply_async(_fit_candidate, (params, X_train_scaled[:samples], y_train[:samples],
+                                                  X_val_scaled, y_val),
+                                 callback=outcomes.put, error_callback=outcomes.put)
+            results = []
+            while len(results) < len(candidates):
+                try:
+                    outcome = outcomes.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if isinstance(outcome, BaseException):
+                    raise outcome
+                results.append(outcome)
+            if len(results) < len(candidates):
+                # Budget ran out mid-rung: keep the previous complete rung
+                timed_out = True
+                break
+
+            finished = sorted(results, key=lambda r: r["accuracy"], reverse=True)
+            history.append({
+                "rung": rung,
+                "samples": samples,
+                "candidates": [
+                    {**r["params"], "accuracy": round(r["accuracy"], 4), "fit_seconds": round(r["fit_seconds"], 3)}
+                    for r in finished
+                ]
+            })
+            candidates = [r["params"] for r in _survivors(finished)]
+            if len(finished) == 1:
+                break
+    finally:
+        # Kills fits still running; a closed pool would let them finish in the background
+        pool.terminate()
+        pool.join()
+
+    if not finished:
+        raise TimeoutError(f"No search rung finished within the {time_budget}s budget")
+
+    probe = X_val[:LATENCY_PROBE_ROWS]
+    measured = []
+    models = {}
+    for result in finished:
+        params = result["params"]
+        models[(params["n_estimators"], params["max_depth"])] = result["model"]
+        measured.append({**params, "accuracy": result["accuracy"],
+                         **measure_candidate(result["model"], scaler, probe)})
+
+    front = pareto_front(measured)
+    chosen = select_candidate(front, min_accuracy)
+    return {
+        "model": models[(chosen["n_estimators"], chosen["max_depth"])],
+        "scaler": scaler,
+        "accuracy": chosen["accuracy"],
+        "search": {
+            "chosen": chosen,
+            "min_accuracy": min_accuracy,
+            "meets_min_accuracy": min_accuracy is None or chosen["accuracy"] >= min_accuracy,
+            "pareto_front": front,
+            "final_rung_samples": history[-1]["samples"],
+            "rungs": history,
+            "timed_out": timed_out,
+            "elapsed_seconds": round(time.monotonic() - started, 3),
+            "time_budget_seconds": time_budget
+        }
+    }
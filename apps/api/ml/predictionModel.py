@@ -2,16 +2,41 @@ from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from typing import List, Optional
+import asyncio
 import os
+import time
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
-from sports_api import create_sports_api_service, LiveMatch, OddsData
+from sports_api import create_async_sports_api_service, LiveMatch, OddsData
 
 load_dotenv()
 
+# Upstream health is probed in the background; /api/health serves the latest snapshot
+HEALTH_REFRESH_SECONDS = float(os.getenv("SPORTS_HEALTH_REFRESH_SECONDS", 60))
+
+
+async def refresh_health_periodically():
+    while True:
+        try:
+            await service.refresh_health()
+        except Exception as e:
+            print(f"Health refresh failed: {e}")
+        await asyncio.sleep(HEALTH_REFRESH_SECONDS)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    refresher = asyncio.create_task(refresh_health_periodically())
+    yield
+    refresher.cancel()
+    await service.aclose()
+
+
 app = FastAPI(
     title="Sports API Aggregation Service",
     description="Multi-source sports data aggregation API supporting NFL, NBA, MLB, and Soccer",
     version="1.0.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -22,7 +47,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-service = create_sports_api_service()
+service = create_async_sports_api_service()
 
 
 @app.get("/")
@@ -33,6 +58,8 @@ async def root():
         "endpoints": {
             "health": "/health",
             "api_health": "/api/health",
+            "http_stats": "/api/http/stats",
+            "cache_stats": "/api/cache/stats",
             "all_matches": "/api/matches",
             "nfl": "/api/nfl",
             "nba": "/api/nba",
@@ -62,29 +89,45 @@ async def health_check():
 @app.get("/api/health")
 async def api_health():
     try:
-        health_status = service.check_api_health()
-        healthy_count = sum(1 for h in health_status if h["status"] == "healthy")
-        total_count = len(health_status)
-        
+        snapshot = service.cached_health()
+        if snapshot is None:
+            # Before the first background refresh, or if refreshes have stalled
+            snapshot = await service.health_snapshot()
         return {
-            "summary": {
-                "healthy": healthy_count,
-                "total": total_count,
-                "percentage": round((healthy_count / total_count) * 100, 2) if total_count > 0 else 0
-            },
-            "services": health_status
+            "summary": snapshot["summary"],
+            "services": snapshot["services"],
+            "checked_at": snapshot["checked_at"],
+            "age_seconds": round(time.monotonic() - snapshot["monotonic"], 3)
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Upstream response cache: fresh/stale hits, shared fetches and errors served from the last good snapshot"""
+    if service.cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **service.cache.stats()}
+
+
+@app.get("/api/http/stats")
+async def http_stats():
+    """Requests sent, and fetches in flight now and at peak, per upstream host"""
+    return service.http_stats()
+
+
 @app.get("/api/matches")
 async def get_all_matches():
+    """All sports fetched concurrently; providers that fail or miss the deadline are listed under sources"""
     try:
-        matches = service.fetch_all_live_matches()
+        report = await service.fetch_live_matches_report()
+        matches = report["matches"]
         return {
             "count": len(matches),
-            "matches": [match.to_dict() for match in matches]
+            "matches": [match.to_dict() for match in matches],
+            "partial": report["partial"],
+            "sources": report["sources"]
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch matches: {str(e)}")
@@ -94,9 +137,9 @@ async def get_all_matches():
 async def get_nfl_matches(source: str = Query("espn", description="Data source: 'rapidapi' or 'espn'")):
     try:
         if source.lower() == "rapidapi":
-            matches = service.fetch_nfl_matches()
+            matches = await service.fetch_nfl_matches()
         else:
-            matches = service.fetch_espn_nfl()
+            matches = await service.fetch_espn_nfl()
         
         return {
             "sport": "NFL",
@@ -114,9 +157,9 @@ async def get_nfl_matches(source: str = Query("espn", description="Data source:
 async def get_nba_matches(source: str = Query("espn", description="Data source: 'rapidapi' or 'espn'")):
     try:
         if source.lower() == "rapidapi":
-            matches = service.fetch_nba_matches()
+            matches = await service.fetch_nba_matches()
         else:
-            matches = service.fetch_espn_nba()
+            matches = await service.fetch_espn_nba()
         
         return {
             "sport": "NBA",
@@ -134,9 +177,9 @@ async def get_nba_matches(source: str = Query("espn", description="Data source:
 async def get_mlb_matches(source: str = Query("espn", description="Data source: 'rapidapi' or 'espn'")):
     try:
         if source.lower() == "rapidapi":
-            matches = service.fetch_mlb_matches()
+            matches = await service.fetch_mlb_matches()
         else:
-            matches = service.fetch_espn_mlb()
+            matches = await service.fetch_espn_mlb()
         
         return {
             "sport": "MLB",
@@ -153,7 +196,7 @@ async def get_mlb_matches(source: str = Query("espn", description="Data source:
 @app.get("/api/soccer")
 async def get_soccer_matches():
     try:
-        matches = service.fetch_soccer_matches()
+        matches = await service.fetch_soccer_matches()
         return {
             "sport": "Soccer",
             "league": "Premier League",
@@ -169,7 +212,7 @@ async def get_soccer_matches():
 @app.get("/api/espn/nfl")
 async def get_espn_nfl():
     try:
-        matches = service.fetch_espn_nfl()
+        matches = await service.fetch_espn_nfl()
         return {
             "sport": "NFL",
             "source": "ESPN",
@@ -196,7 +239,7 @@ async def get_best_odds(sport: str):
                 detail=f"Unsupported sport: {sport}. Supported: NFL, NBA, MLB, SOCCER"
             )
         
-        odds = service.fetch_odds_data(sport_upper)
+        odds = await service.fetch_odds_data(sport_upper)
         
         # Find best odds for each game
         best_odds = {}
@@ -246,7 +289,7 @@ async def get_best_odds(sport: str):
 @app.get("/api/espn/nba")
 async def get_espn_nba():
     try:
-        matches = service.fetch_espn_nba()
+        matches = await service.fetch_espn_nba()
         return {
             "sport": "NBA",
             "source": "ESPN",
@@ -260,7 +303,7 @@ async def get_espn_nba():
 @app.get("/api/espn/mlb")
 async def get_espn_mlb():
     try:
-        matches = service.fetch_espn_mlb()
+        matches = await service.fetch_espn_mlb()
         return {
             "sport": "MLB",
             "source": "ESPN",
@@ -290,7 +333,7 @@ async def get_odds(
                 detail=f"Unsupported sport: {sport}. Supported: NFL, NBA, MLB, SOCCER"
             )
         
-        odds = service.fetch_odds_data(sport_upper, bookmaker=bookmaker)
+        odds = await service.fetch_odds_data(sport_upper, bookmaker=bookmaker)
         
         # Group odds by game for better readability
         games_odds = {}
@@ -339,7 +382,7 @@ async def get_soccer_predictions(
     - date=tomorrow → get tomorrow's predictions
     """
     try:
-        predictions = service.fetch_mybetstoday_predictions(
+        predictions = await service.fetch_mybetstoday_predictions(
             min_confidence=min_confidence,
             max_odds=max_odds,
             date=date
@@ -491,7 +534,7 @@ async def get_combined_predictions(
     """
     try:
         # Fetch from both sources
-        mybets_predictions = service.fetch_mybetstoday_predictions(
+        mybets_predictions = await service.fetch_mybetstoday_predictions(
             min_confidence=min_confidence,
             date=date
         )
@@ -534,42 +577,258 @@ async def get_combined_predictions(
                         "status": "verified"
                     })
                     break
-       
+
+        combined_predictions.sort(key=lambda p: p["average_confidence"], reverse=True)
+
+        return {
+            "source": "MyBetsToday + StatArea",
+            "description": f"Predictions confirmed by both sources with confidence >= {min_confidence}%",
+            "filter": {
+                "min_confidence": min_confidence,
+                "date": date,
+                "total_available": len(combined_predictions)
+            },
+            "count": len(combined_predictions),
+            "predictions": combined_predictions
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch combined predictions: {str(e)}")
+
+
 import numpy as np
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional, Tuple
+import math
 import pickle
 import os
+import threading
+import time
+import uuid
+from collections import deque
+from tree_engine import CompiledForest
+from model_artifact import load_artifact, save_artifact
+from model_search import search_forest
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def fit_forest(data: List[List[float]], labels: List[int], features_required: int = 7) -> Dict[str, Any]:
+    """
+    Fit scaler + forest and score them on a 25% holdout.
+    Module-level and free of predictor state so it can run in a worker process.
+    """
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.metrics import accuracy_score
+
+    if len(data) == 0 or len(data[0]) != features_required:
+        raise ValueError(f"Training data must have {features_required} features per sample")
+
+    X = np.array(data)
+    y = np.array(labels)
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.25, random_state=42)
+
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    X_test_scaled = scaler.transform(X_test)
+
+    model = RandomForestClassifier(n_estimators=100, max_depth=10, random_state=42)
+    model.fit(X_train_scaled, y_train)
+
+    y_pred = model.predict(X_test_scaled)
+    return {
+        "model": model,
+        "scaler": scaler,
+        "accuracy": float(accuracy_score(y_test, y_pred))
+    }
+
+
+def rescale_tree_thresholds(model: Any, old_mean: np.ndarray, old_scale: np.ndarray,
+                            new_mean: np.ndarray, new_scale: np.ndarray) -> None:
+    """
+    Move every split threshold of a fitted forest from the old scaler's space
+    into the new one's, so existing trees keep splitting raw features at the
+    same values after the scaler statistics change.
+    """
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        state = tree.__getstate__()
+        nodes = state["nodes"].copy()
+        internal = nodes["left_child"] != -1
+        feature = nodes["feature"][internal]
+        raw_threshold = nodes["threshold"][internal] * old_scale[feature] + old_mean[feature]
+        nodes["threshold"][internal] = (raw_threshold - new_mean[feature]) / new_scale[feature]
+        state["nodes"] = nodes
+        tree.__setstate__(state)
+
+
+def check_incremental_labels(labels: List[int], classes: Any, test_size: float = 0.25) -> None:
+    """
+    Reject a batch update_forest cannot use: it must hold exactly the model's
+    classes, with at least two samples of each so the stratified split keeps
+    every class on both sides, and a holdout with room for every class.
+    """
+    known = set(np.asarray(classes).tolist())
+    values, counts = np.unique(np.asarray(labels), return_counts=True)
+    seen = set(values.tolist())
+    if known != seen:
+        raise ValueError(
+            f"Incremental data must contain exactly the model's classes {sorted(known)}"
+            f" (missing {sorted(known - seen)}, unknown {sorted(seen - known)})"
+        )
+    sparse = sorted(value for value, count in zip(values.tolist(), counts.tolist()) if count < 2)
+    if sparse:
+        raise ValueError(f"Incremental data needs at least 2 samples of every class; classes {sparse} have 1")
+    if math.ceil(len(labels) * test_size) < len(known):
+        raise ValueError(
+            f"Incremental data needs at least {math.ceil(len(known) / test_size)} samples"
+            f" to hold out every class, got {len(labels)}"
+        )
+
+
+def update_forest(model: Any, scaler: Any, data: List[List[float]], labels: List[int],
+                  new_trees: int = 20, max_trees: int = 300,
+                  features_required: int = 7) -> Dict[str, Any]:
+    """
+    Incrementally update a fitted scaler + forest with new labelled samples.
+    The scaler statistics are updated with partial_fit and the existing trees'
+    thresholds are remapped to match. new_trees trees are then grown on the new
+    samples only (warm_start), and the oldest trees beyond max_trees are dropped.
+    The cost grows with the new data, not the full history. Accuracy is measured
+    on a stratified 25% holdout of the new samples, so the new trees see every
+    class the old ones do (see check_incremental_labels). The inputs are not modified.
+    """
+    import copy
+    from sklearn.model_selection import train_test_split
+    from sklearn.metrics import accuracy_score
+
+    if len(data) == 0 or len(data[0]) != features_required:
+        raise ValueError(f"Training data must have {features_required} features per sample")
+
+    check_incremental_labels(labels, model.classes_)
+    X = np.array(data)
+    y = np.array(labels)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.25, random_state=42, stratify=y)
+
+    model = copy.deepcopy(model)
+    scaler = copy.deepcopy(scaler)
+    old_mean, old_scale = scaler.mean_.copy(), scaler.scale_.copy()
+    scaler.partial_fit(X_train)
+    rescale_tree_thresholds(model, old_mean, old_scale, scaler.mean_, scaler.scale_)
+
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + new_trees)
+    model.fit(scaler.transform(X_train), y_train)
+    if len(model.estimators_) > max_trees:
+        model.estimators_ = model.estimators_[-max_trees:]
+        model.n_estimators = max_trees
+
+    y_pred = model.predict(scaler.transform(X_test))
+    return {
+        "model": model,
+        "scaler": scaler,
+        "accuracy": float(accuracy_score(y_test, y_pred))
+    }
+
+
+class ModelBundle:
+    """
+    A trained scaler + forest (and its compiled engine) that is activated as a
+    single reference, so a prediction never mixes parts of two models.
+    """
+
+    __slots__ = ("model", "scaler", "engine", "accuracy", "revision", "model_id")
+
+    def __init__(self, model: Any, scaler: Any, engine: Optional[CompiledForest],
+                 accuracy: float, revision: int, model_id: Optional[str] = None):
+        self.model = model
+        self.scaler = scaler
+        self.engine = engine
+        self.accuracy = accuracy
+        self.revision = revision
+        # Written to both the pickle and the artifact, so the pair can be matched up later
+        self.model_id = model_id
+
+
 class MagajiCoMLPredictor:
-    def __init__(self, model_path: Optional[str] = None):
+    INFERENCE_ENGINES = ("sklearn", "compiled")
+    # Above this many rows sklearn's Cython tree walk beats the NumPy engine
+    COMPILED_BATCH_LIMIT = 256
+
+    def __init__(self, model_path: Optional[str] = None, inference_engine: str = "compiled",
+                 artifact_path: Optional[str] = None, shared_store: Any = None,
+                 inference_observer: Optional[Callable[[int, float, float], None]] = None,
+                 model_version: str = "MagajiCo-v2.2"):
         """
         Initialize MagajiCo ML Predictor.
         Supports either loading a pre-trained model or using strategic v2.0 logic.
+        inference_engine selects how a trained forest is evaluated: "sklearn"
+        calls predict_proba, "compiled" walks flattened node tables (tree_engine).
+        When the memory-mapped artifact (model_artifact) exists it is loaded
+        instead of the pickle: no unpickling, and workers share its pages. The
+        "sklearn" engine needs the pickled objects, so it loads the pickle when
+        there is one.
+        With a shared_store (shared_model.SharedModelStore) the model comes from
+        shared memory instead of disk, and models published by other worker
+        processes are picked up through sync_shared_model. The first worker to
+        start loads the model from disk and publishes it.
+        inference_observer, if given, is called as (rows, scaler_seconds,
+        model_seconds) after every trained-model prediction.
+        model_version names the model in responses and cache keys; the model
+        registry gives each registered model its own (e.g. "football/v3").
         """
-        self.model_version = "MagajiCo-v2.2"
-        self.accuracy = 0.87
+        if inference_engine not in self.INFERENCE_ENGINES:
+            raise ValueError(f"inference_engine must be one of {self.INFERENCE_ENGINES}")
+        self.inference_engine = inference_engine
+        self.model_version = model_version
+        self.rule_based_accuracy = 0.87
         self.features_required = 7
         self.prediction_types = ["home", "draw", "away"]
+        self.model_path = model_path or os.path.join(os.path.dirname(__file__), "model_data.pkl")
+        self.artifact_path = artifact_path or os.path.splitext(self.model_path)[0] + ".forest"
 
-        self.model = None
-        self.scaler = None
+        # Readers take one reference to _active; writers replace it wholesale
+        self._active: Optional[ModelBundle] = None
+        self._previous: deque = deque(maxlen=3)
+        self._last_revision = 0
+        self._swap_lock = threading.Lock()
+        self.shared_store = shared_store
+        self._shared_generation = 0
+        self.inference_observer = inference_observer
 
-        if model_path and os.path.exists(model_path):
+        prefer_pickle = inference_engine == "sklearn" and os.path.exists(self.model_path)
+        if shared_store is not None:
+            self.sync_shared_model()
+        if self._active is None and os.path.exists(self.artifact_path) and not prefer_pickle:
             try:
-                with open(model_path, "rb") as f:
-                    saved = pickle.load(f)
-                    self.model = saved["model"]
-                    self.scaler = saved["scaler"]
-                    self.accuracy = saved.get("accuracy", 0.87)
-                logger.info(f"✅ Loaded trained model from {model_path}")
+                engine, metadata = load_artifact(self.artifact_path)
+                self._active = self._build_bundle(None, None, metadata.get("accuracy") or 0.87, engine=engine,
+                                                  model_id=metadata.get("model_id"))
+                logger.info(f"✅ Mapped model artifact from {self.artifact_path}")
+                if inference_engine == "sklearn":
+                    logger.warning(f"⚠️ No pickle at {self.model_path}, using the compiled engine")
             except Exception as e:
-                logger.error(f"⚠️ Failed to load model: {e}, falling back to rule-based")
-        else:
-            logger.info("⚠️ No trained model found, using MagajiCo strategic v2.0 rules")
+                logger.error(f"⚠️ Failed to map model artifact: {e}")
+
+        if self._active is None:
+            pickle_path = self.model_path if prefer_pickle else model_path
+            if pickle_path and os.path.exists(pickle_path):
+                try:
+                    with open(pickle_path, "rb") as f:
+                        saved = pickle.load(f)
+                    self._active = self._build_bundle(saved["model"], saved["scaler"], saved.get("accuracy", 0.87),
+                                                      model_id=saved.get("model_id"))
+                    logger.info(f"✅ Loaded trained model from {pickle_path}")
+                except Exception as e:
+                    logger.error(f"⚠️ Failed to load model: {e}, falling back to rule-based")
+            else:
+                logger.info("⚠️ No trained model found, using MagajiCo strategic v2.0 rules")
+
+        if shared_store is not None:
+            if self._shared_generation == 0:
+                self.share_model(shared_store)
+            logger.info(f"✅ Attached to shared model generation {self._shared_generation}")
 
     def predict(self, features: List[float]) -> Dict[str, Any]:
         """
@@ -580,11 +839,20 @@ class MagajiCoMLPredictor:
         if len(features) < self.features_required:
             raise ValueError(f"At least {self.features_required} features required")
 
+        bundle = self._active
         try:
-            if self.model:  # ML Model Path
-                features_array = np.array([features])
-                features_scaled = self.scaler.transform(features_array)
-                probabilities = self.model.predict_proba(features_scaled)[0]
+            if bundle is not None:  # ML Model Path
+                started = time.perf_counter()
+                if bundle.engine is not None:
+                    features_scaled = bundle.engine.transform(np.asarray(features, dtype=np.float64))
+                    scaled = time.perf_counter()
+                    probabilities = bundle.engine.predict_proba_row_scaled(features_scaled)
+                else:
+                    features_array = np.array([features])
+                    features_scaled = bundle.scaler.transform(features_array)
+                    scaled = time.perf_counter()
+                    probabilities = bundle.model.predict_proba(features_scaled)[0]
+                self._observe_inference(1, started, scaled)
                 prediction_index = int(np.argmax(probabilities))
 
                 return {
@@ -606,6 +874,86 @@ class MagajiCoMLPredictor:
             logger.error(f"Prediction error: {str(e)}")
             raise
 
+    def predict_batch(self, matrix: Any) -> List[Dict[str, Any]]:
+        """
+        Predict outcomes for an (N, 7) feature matrix in one pass.
+        Scaling, predict_proba and argmax run once for the whole matrix
+        instead of once per row.
+        """
+        features_matrix = self._as_matrix(matrix)
+        if features_matrix.shape[0] == 0:
+            return []
+
+        probabilities, prediction_indices, using_model = self._predict_matrix(features_matrix)
+        return self._format_batch(probabilities, prediction_indices, using_model=using_model)
+
+    def predict_proba_batch(self, matrix: Any) -> np.ndarray:
+        """(N, 3) home/draw/away probabilities, without building per-row dicts"""
+        features_matrix = self._as_matrix(matrix)
+        if features_matrix.shape[0] == 0:
+            return np.empty((0, len(self.prediction_types)), dtype=np.float64)
+        return self._predict_matrix(features_matrix)[0]
+
+    def _predict_matrix(self, features_matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray, bool]:
+        bundle = self._active
+        try:
+            if bundle is not None:
+                use_engine = bundle.engine is not None and (
+                    bundle.model is None or features_matrix.shape[0] <= self.COMPILED_BATCH_LIMIT
+                )
+                started = time.perf_counter()
+                if use_engine:
+                    features_scaled = bundle.engine.transform(features_matrix)
+                    scaled = time.perf_counter()
+                    probabilities = bundle.engine.predict_proba_scaled(features_scaled)
+                else:
+                    features_scaled = bundle.scaler.transform(features_matrix)
+                    scaled = time.perf_counter()
+                    probabilities = bundle.model.predict_proba(features_scaled)
+                self._observe_inference(features_matrix.shape[0], started, scaled)
+                return probabilities, np.argmax(probabilities, axis=1), True
+
+            probabilities, prediction_indices = self._fallback_predict_batch(features_matrix)
+            return probabilities, prediction_indices, False
+
+        except Exception as e:
+            logger.error(f"Batch prediction error: {str(e)}")
+            raise
+
+    def _observe_inference(self, rows: int, started: float, scaled: float) -> None:
+        if self.inference_observer is not None:
+            self.inference_observer(rows, scaled - started, time.perf_counter() - scaled)
+
+    def _as_matrix(self, matrix: Any) -> np.ndarray:
+        features_matrix = np.asarray(matrix, dtype=np.float64)
+        if features_matrix.size == 0:
+            return features_matrix.reshape(0, self.features_required)
+        if features_matrix.ndim != 2 or features_matrix.shape[1] != self.features_required:
+            raise ValueError(
+                f"Feature matrix must have shape (N, {self.features_required}), got {features_matrix.shape}"
+            )
+        return features_matrix
+
+    def _format_batch(self, probabilities: np.ndarray, prediction_indices: np.ndarray,
+                      using_model: bool) -> List[Dict[str, Any]]:
+        # tolist() converts the whole matrix to Python floats in one call
+        rows = probabilities.tolist()
+        indices = prediction_indices.tolist()
+        return [
+            {
+                "prediction": self.prediction_types[index],
+                "confidence": row[index],
+                "probabilities": {
+                    "home": row[0],
+                    "draw": row[1],
+                    "away": row[2]
+                },
+                "model_version": self.model_version,
+                "using_model": using_model
+            }
+            for row, index in zip(rows, indices)
+        ]
+
     def _fallback_predict(self, features: List[float]) -> Dict[str, Any]:
         """Strategic MagajiCo rule-based prediction"""
         home_strength, away_strength, home_advantage, recent_form_home, recent_form_away, head_to_head, injuries = features
@@ -658,49 +1006,311 @@ class MagajiCoMLPredictor:
             "using_model": False
         }
 
+    def _fallback_predict_batch(self, features_matrix: np.ndarray):
+        """
+        Matrix version of _fallback_predict.
+        Returns an (N, 3) home/draw/away probability array and the chosen outcome
+        index per row. The operations run in the same order as the scalar path,
+        so the results match it bit for bit.
+        """
+        (home_strength, away_strength, home_advantage, recent_form_home,
+         recent_form_away, head_to_head, injuries) = features_matrix.T
+
+        home_score = (
+            home_strength * 0.3 +
+            home_advantage * 0.2 +
+            recent_form_home * 0.25 +
+            head_to_head * 0.15 +
+            injuries * 0.1
+        )
+
+        away_score = (
+            away_strength * 0.3 +
+            (1 - home_advantage) * 0.1 +
+            recent_form_away * 0.25 +
+            (1 - head_to_head) * 0.15 +
+            injuries * 0.2
+        )
+
+        total_score = home_score + away_score + 0.5
+        home_prob = home_score / total_score
+        away_prob = away_score / total_score
+        draw_prob = 0.5 / total_score
+
+        # normalize
+        total_prob = home_prob + draw_prob + away_prob
+        home_prob /= total_prob
+        draw_prob /= total_prob
+        away_prob /= total_prob
+
+        # select outcome: ties go to draw, as in the scalar path
+        prediction_indices = np.full(features_matrix.shape[0], 1, dtype=np.intp)
+        prediction_indices[away_prob > np.maximum(home_prob, draw_prob)] = 2
+        prediction_indices[home_prob > np.maximum(away_prob, draw_prob)] = 0
+
+        probabilities = np.column_stack((home_prob, draw_prob, away_prob))
+        return probabilities, prediction_indices
+
     def train(self, data: List[List[float]], labels: List[int]) -> Dict[str, Any]:
         """Train the ML model with provided data"""
-        from sklearn.model_selection import train_test_split
-        from sklearn.preprocessing import StandardScaler
-        from sklearn.ensemble import RandomForestClassifier
-        from sklearn.metrics import accuracy_score
-        
-        if len(data) == 0 or len(data[0]) != self.features_required:
-            raise ValueError(f"Training data must have {self.features_required} features per sample")
-        
-        X = np.array(data)
-        y = np.array(labels)
-        
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.25, random_state=42)
-        
-        self.scaler = StandardScaler()
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_test_scaled = self.scaler.transform(X_test)
-        
-        self.model = RandomForestClassifier(n_estimators=100, max_depth=10, random_state=42)
-        self.model.fit(X_train_scaled, y_train)
-        
-        y_pred = self.model.predict(X_test_scaled)
-        self.accuracy = float(accuracy_score(y_test, y_pred))
-        
-        # Save model
-        model_path = os.path.join(os.path.dirname(__file__), "model_data.pkl")
-        with open(model_path, "wb") as f:
-            pickle.dump({"model": self.model, "scaler": self.scaler, "accuracy": self.accuracy}, f)
-        
-        logger.info(f"✅ Model trained with accuracy: {self.accuracy:.2f}")
-        
+        trained = fit_forest(data, labels, self.features_required)
+        return self.install_model(trained)
+
+    def update(self, data: List[List[float]], labels: List[int], new_trees: int = 20,
+               max_trees: int = 300) -> Dict[str, Any]:
+        """Grow the active model with new samples instead of retraining it (see update_forest)"""
+        model, scaler = self.sklearn_model()
+        trained = update_forest(model, scaler, data, labels, new_trees, max_trees, self.features_required)
+        return self.install_model(trained)
+
+    def supports_update(self) -> bool:
+        """Whether update() can run: the active model's sklearn objects are in memory or pickled next to it"""
+        bundle = self._active
+        return bundle is not None and (bundle.model is not None or os.path.exists(self.model_path))
+
+    def sklearn_model(self) -> Tuple[Any, Any]:
+        """
+        The active forest and scaler as sklearn objects, which incremental
+        training needs. A model mapped from the artifact (at startup or from
+        the shared store) has none in memory; they are unpickled from
+        model_path on first use, provided the pickle holds that same model.
+        """
+        bundle = self._active
+        if bundle is None:
+            raise ValueError("Incremental training needs an active sklearn model; run a full training first")
+        if bundle.model is not None:
+            return bundle.model, bundle.scaler
+        if not os.path.exists(self.model_path):
+            raise ValueError(f"Incremental training needs the active model's pickle at {self.model_path}; "
+                             "run a full training first")
+
+        with open(self.model_path, "rb") as f:
+            saved = pickle.load(f)
+        if saved.get("model_id") != bundle.model_id:
+            raise ValueError(f"{self.model_path} holds a different model than the active one; "
+                             "run a full training first")
+        loaded = ModelBundle(saved["model"], saved["scaler"], bundle.engine, bundle.accuracy,
+                             bundle.revision, bundle.model_id)
+        with self._swap_lock:
+            if self._active is bundle:
+                self._active = loaded
+        return loaded.model, loaded.scaler
+
+    def search(self, data: List[List[float]], labels: List[int], time_budget: float = 60.0,
+               min_accuracy: Optional[float] = None) -> Dict[str, Any]:
+        """Pick forest size and depth within time_budget seconds (see model_search.search_forest)"""
+        trained = search_forest(data, labels, time_budget, min_accuracy,
+                                features_required=self.features_required)
+        return {**self.install_model(trained), "search": trained["search"]}
+
+    def install_model(self, trained: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Activate and persist a model produced by fit_forest (possibly in another process).
+        The artifact is written to a temporary file and renamed into place, then the
+        in-memory bundle is swapped in one assignment; in-flight predictions finish
+        on the model they started with.
+        """
+        bundle = self._build_bundle(trained["model"], trained["scaler"], trained["accuracy"])
+
+        with self._swap_lock:
+            self._save_bundle(bundle)
+            if self._active is not None:
+                self._previous.append(self._active)
+            self._active = bundle
+
+        logger.info(f"✅ Model trained with accuracy: {bundle.accuracy:.2f}")
+
         return {
             "message": "Training complete",
-            "accuracy": self.accuracy,
-            "model_version": self.model_version
+            "accuracy": bundle.accuracy,
+            "model_version": self.model_version,
+            "model_revision": bundle.revision,
+            "n_trees": len(bundle.model.estimators_)
         }
 
+    def rollback(self) -> Dict[str, Any]:
+        """
+        Reactivate the model that was active before the last install. With a
+        shared store the history is the store's, so it is the same whichever
+        worker handles the rollback.
+        """
+        if self.shared_store is not None:
+            bundle = self._rollback_shared()
+        else:
+            with self._swap_lock:
+                if not self._previous:
+                    raise ValueError("No previous model to roll back to")
+                bundle = self._previous.pop()
+                self._save_bundle(bundle)
+                self._active = bundle
+
+        logger.info(f"↩️ Rolled back to model revision {bundle.revision}")
+        return {
+            "message": "Rollback complete",
+            "accuracy": bundle.accuracy,
+            "model_version": self.model_version,
+            "model_revision": bundle.revision
+        }
+
+    def _rollback_shared(self) -> ModelBundle:
+        engine, metadata, generation = self.shared_store.rollback()
+        model_id = metadata.get("model_id")
+        # This worker still holds the sklearn objects if it installed that model itself
+        bundle = next((b for b in self._previous if b.model is not None and b.model_id == model_id), None)
+        if bundle is None:
+            bundle = self._build_bundle(None, None, metadata.get("accuracy") or self.rule_based_accuracy,
+                                        engine=engine, model_id=model_id)
+        with self._swap_lock:
+            self._save_bundle(bundle, publish=False)
+            self._active = bundle
+            self._shared_generation = max(self._shared_generation, generation)
+        return bundle
+
+    def _build_bundle(self, model: Any, scaler: Any, accuracy: float,
+                      engine: Optional[CompiledForest] = None, model_id: Optional[str] = None) -> ModelBundle:
+        with self._swap_lock:
+            self._last_revision += 1
+            revision = self._last_revision
+        if engine is None:
+            engine = self._compile_engine(model, scaler)
+        if model_id is None and model is not None:
+            model_id = uuid.uuid4().hex
+        return ModelBundle(model, scaler, engine, float(accuracy), revision, model_id)
+
+    def _save_bundle(self, bundle: ModelBundle, publish: bool = True) -> None:
+        if bundle.model is not None:
+            tmp_path = f"{self.model_path}.tmp-{os.getpid()}"
+            with open(tmp_path, "wb") as f:
+                pickle.dump({"model": bundle.model, "scaler": bundle.scaler, "accuracy": bundle.accuracy,
+                             "model_id": bundle.model_id}, f)
+            os.replace(tmp_path, self.model_path)
+        elif os.path.exists(self.model_path):
+            # Artifact-only bundles (mapped at startup) have no sklearn objects to pickle; drop the
+            # pickle of the newer model so the two files on disk never describe different models
+            os.remove(self.model_path)
+
+        engine = bundle.engine
+        if engine is None:
+            engine = CompiledForest.from_sklearn(bundle.model, bundle.scaler)
+        metadata = {"accuracy": bundle.accuracy, "version": self.model_version, "model_id": bundle.model_id}
+        save_artifact(self.artifact_path, engine, metadata)
+        if publish and self.shared_store is not None:
+            self._shared_generation = self.shared_store.publish(engine, metadata)
+
+    def share_model(self, shared_store: Any) -> None:
+        """
+        Publish the active model to shared memory, unless another worker
+        already published one (which is then swapped in), and keep it in sync
+        from now on
+        """
+        self.shared_store = shared_store
+        bundle = self._active
+        if bundle is not None:
+            engine = bundle.engine
+            if engine is None:
+                engine = CompiledForest.from_sklearn(bundle.model, bundle.scaler)
+            self._shared_generation = shared_store.publish(
+                engine, {"accuracy": bundle.accuracy, "version": self.model_version, "model_id": bundle.model_id},
+                if_empty=True
+            )
+        self.sync_shared_model()
+
+    def sync_shared_model(self) -> bool:
+        """
+        Swap in a model another process published to the shared store.
+        Costs one 8-byte read when nothing changed; returns True if the model changed.
+        """
+        store = self.shared_store
+        if store is None or store.generation == self._shared_generation:
+            return False
+
+        loaded = store.load()
+        if loaded is None:
+            return False
+        engine, metadata, generation = loaded
+        bundle = self._build_bundle(None, None, metadata.get("accuracy") or self.rule_based_accuracy, engine=engine,
+                                    model_id=metadata.get("model_id"))
+
+        with self._swap_lock:
+            if generation <= self._shared_generation:
+                return False
+            if self._active is not None:
+                self._previous.append(self._active)
+            self._active = bundle
+            self._shared_generation = generation
+        return True
+
+    def _compile_engine(self, model: Any, scaler: Any) -> Optional[CompiledForest]:
+        """Flatten a forest into node tables when the compiled engine is selected"""
+        if self.inference_engine != "compiled":
+            return None
+        try:
+            return CompiledForest.from_sklearn(model, scaler)
+        except Exception as e:
+            logger.error(f"⚠️ Failed to compile model: {e}, using sklearn inference")
+            return None
+
+    @property
+    def model(self) -> Any:
+        bundle = self._active
+        return bundle.model if bundle is not None else None
+
+    @property
+    def scaler(self) -> Any:
+        bundle = self._active
+        return bundle.scaler if bundle is not None else None
+
+    @property
+    def classes(self) -> Optional[np.ndarray]:
+        bundle = self._active
+        if bundle is None:
+            return None
+        return bundle.model.classes_ if bundle.model is not None else bundle.engine.classes
+
+    @property
+    def engine(self) -> Optional[CompiledForest]:
+        bundle = self._active
+        return bundle.engine if bundle is not None else None
+
+    @property
+    def accuracy(self) -> float:
+        bundle = self._active
+        return bundle.accuracy if bundle is not None else self.rule_based_accuracy
+
+    @property
+    def model_revision(self) -> int:
+        """Changes whenever the active model changes; part of every cache key"""
+        bundle = self._active
+        return bundle.revision if bundle is not None else 0
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the active model's node tables"""
+        bundle = self._active
+        if bundle is None:
+            return 0
+        nbytes = bundle.engine.info()["nbytes"] if bundle.engine is not None else 0
+        if bundle.model is not None:
+            nbytes += sum(estimator.tree_.__getstate__()["nodes"].nbytes + estimator.tree_.value.nbytes
+                          for estimator in bundle.model.estimators_)
+        return nbytes
+
+    @property
+    def model_key(self) -> str:
+        """Identity of the active model, used to namespace cached predictions"""
+        return f"{self.model_version}:{self.model_revision}"
+
     def get_model_info(self) -> Dict[str, Any]:
+        bundle = self._active
+        engine = bundle.engine if bundle is not None else None
         return {
             "version": self.model_version,
-            "accuracy": self.accuracy,
+            "revision": bundle.revision if bundle is not None else 0,
+            "accuracy": bundle.accuracy if bundle is not None else self.rule_based_accuracy,
             "features_required": self.features_required,
             "prediction_types": self.prediction_types,
-            "using_model": bool(self.model)
+            "using_model": bundle is not None,
+            "inference_engine": "compiled" if engine is not None else "sklearn",
+            "engine": engine.info() if engine is not None else None,
+            "rollback_available": len(self._previous) > 0
         }
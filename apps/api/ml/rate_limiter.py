@@ -0,0 +1,187 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # optional: only needed for the shared backend
+    aioredis = None
+
+
+class RateLimit:
+    """requests per period seconds, with bursts of up to burst requests"""
+
+    def __init__(self, requests: int, period: float = 60.0, burst: Optional[int] = None):
+        self.requests = requests
+        self.period = period
+        self.rate = requests / period
+        self.capacity = float(burst if burst is not None else requests)
+
+
+class LocalBucketBackend:
+    """
+    In-process token buckets.
+    Client state lives in an LRU of at most max_clients entries; buckets idle for
+    idle_ttl seconds are swept (an idle bucket is full, so dropping it is free).
+    """
+
+    def __init__(self, max_clients: int = 10000, idle_ttl: float = 300.0, sweep_interval: float = 30.0):
+        self.max_clients = max_clients
+        self.idle_ttl = idle_ttl
+        self.sweep_interval = sweep_interval
+        # key -> [tokens, last_refill]; LRU order is also last_refill order
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self._next_sweep = time.monotonic() + sweep_interval
+        self.evictions = 0
+        self.swept = 0
+
+    async def take(self, key: str, limit: RateLimit) -> Tuple[bool, float]:
+        """Spend one token; returns (allowed, tokens remaining)"""
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self.sweep(now)
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [limit.capacity, now]
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+                self.evictions += 1
+        else:
+            bucket[0] = min(limit.capacity, bucket[0] + (now - bucket[1]) * limit.rate)
+            bucket[1] = now
+            self._buckets.move_to_end(key)
+
+        if bucket[0] >= 1.0:
+            bucket[0] -= 1.0
+            return True, bucket[0]
+        return False, bucket[0]
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        now = time.monotonic() if now is None else now
+        self._next_sweep = now + self.sweep_interval
+        removed = 0
+        # Oldest first: stop at the first bucket that is still active
+        while self._buckets:
+            key, (_, last_refill) = next(iter(self._buckets.items()))
+            if now - last_refill < self.idle_ttl:
+                break
+            del self._buckets[key]
+            removed += 1
+        self.swept += removed
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "local",
+            "tracked_clients": len(self._buckets),
+            "max_clients": self.max_clients,
+            "evictions": self.evictions,
+            "swept": self.swept
+        }
+
+
+# Refill and spend atomically on the Redis server, using its clock
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local ttl = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], ttl)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisBucketBackend:
+    """
+    Token buckets shared by every worker through Redis.
+    Idle buckets expire server-side, so memory stays bounded by active clients.
+    """
+
+    def __init__(self, url: str, idle_ttl: int = 300, prefix: str = "magajico:ratelimit:"):
+        if aioredis is None:
+            raise RuntimeError("The redis package is required for the shared rate limit backend")
+        self.client = aioredis.from_url(url)
+        self.idle_ttl = idle_ttl
+        self.prefix = prefix
+        self._script = self.client.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    async def take(self, key: str, limit: RateLimit) -> Tuple[bool, float]:
+        allowed, tokens = await self._script(
+            keys=[self.prefix + key],
+            args=[limit.rate, limit.capacity, self.idle_ttl]
+        )
+        return bool(allowed), float(tokens)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "redis", "idle_ttl": self.idle_ttl}
+
+
+class RateLimiter:
+    """Per-client, per-route token bucket limits on top of a bucket backend"""
+
+    def __init__(self, backend: Any, default_limit: RateLimit,
+                 route_limits: Optional[Dict[str, RateLimit]] = None):
+        self.backend = backend
+        self.default_limit = default_limit
+        self.route_limits = route_limits or {}
+        self.allowed = 0
+        self.rejected = 0
+
+    async def check(self, client: str, path: str) -> Tuple[bool, RateLimit, float]:
+        """Returns (allowed, applicable limit, tokens remaining)"""
+        limit = self.route_limits.get(path)
+        if limit is None:
+            limit, route = self.default_limit, "*"
+        else:
+            route = path
+
+        allowed, remaining = await self.backend.take(f"{route}|{client}", limit)
+        if allowed:
+            self.allowed += 1
+        else:
+            self.rejected += 1
+        return allowed, limit, remaining
+
+    @staticmethod
+    def retry_after(limit: RateLimit, remaining: float) -> int:
+        """Whole seconds until the next token is available"""
+        return max(1, int((1.0 - remaining) / limit.rate + 0.999))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "default_per_minute": round(self.default_limit.rate * 60, 2),
+            "routes": {path: round(limit.rate * 60, 2) for path, limit in self.route_limits.items()},
+            **self.backend.stats()
+        }
+
+
+def parse_route_limits(spec: str) -> Dict[str, RateLimit]:
+    """Parse "/predict/batch=30,/train=10" (requests per minute per route)"""
+    limits = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        path, _, per_minute = item.partition("=")
+        path, per_minute = path.strip(), per_minute.strip()
+        if not path.startswith("/") or not per_minute.isdigit() or int(per_minute) == 0:
+            raise ValueError(
+                f"Invalid ML_RATE_LIMIT_ROUTES entry {item!r}: expected /path=<requests per minute>"
+            )
+        limits[path] = RateLimit(int(per_minute))
+    return limits
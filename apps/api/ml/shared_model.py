@@ -0,0 +1,155 @@
+import json
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from model_artifact import load_artifact, save_artifact
+from tree_engine import CompiledForest
+
+# tmpfs-backed POSIX shared memory on Linux; any temp dir works elsewhere
+SHM_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+class SharedModelStore:
+    """
+    Model tables shared by every worker process through shared memory.
+
+    Each published model is written once as a model_artifact file in SHM_DIR and
+    mapped read-only by the workers, so N workers hold one physical copy of the
+    forest. A small memory-mapped control block holds the current generation;
+    the segment name is derived from it, so readers only need one aligned 8-byte
+    load to notice that another worker has published a new model.
+
+    The segments of the last max_history replaced models are kept, so any
+    worker can roll back to them. state_dir holds other state the workers
+    share (training job files and locks).
+    """
+
+    CONTROL_SIZE = 8
+
+    def __init__(self, control_path: str, max_history: int = 3):
+        self.control_path = control_path
+        self.prefix = control_path[:-len(".control")]
+        self.state_dir = f"{self.prefix}.state"
+        self.max_history = max_history
+        with open(control_path, "r+b") as f:
+            self._control = mmap.mmap(f.fileno(), self.CONTROL_SIZE)
+
+    @classmethod
+    def create(cls) -> "SharedModelStore":
+        control_path = os.path.join(SHM_DIR, f"magajico-model-{uuid.uuid4().hex[:12]}.control")
+        with open(control_path, "wb") as f:
+            f.write(b"\0" * cls.CONTROL_SIZE)
+        store = cls(control_path)
+        os.makedirs(store.state_dir, exist_ok=True)
+        return store
+
+    @property
+    def generation(self) -> int:
+        return struct.unpack_from("<q", self._control, 0)[0]
+
+    def _segment_path(self, generation: int) -> str:
+        return f"{self.prefix}-{generation}.forest"
+
+    def _history_path(self) -> str:
+        return f"{self.prefix}.history"
+
+    def _read_history(self) -> List[int]:
+        try:
+            with open(self._history_path()) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+
+    def _write_history(self, history: List[int]) -> None:
+        tmp_path = f"{self._history_path()}.tmp-{os.getpid()}"
+        with open(tmp_path, "w") as f:
+            json.dump(history, f)
+        os.replace(tmp_path, self._history_path())
+
+    def _set_generation(self, generation: int) -> None:
+        struct.pack_into("<q", self._control, 0, generation)
+        self._control.flush()
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        # Existing mappings of a segment stay valid after unlink
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def publish(self, engine: CompiledForest, metadata: Optional[Dict[str, Any]] = None,
+                if_empty: bool = False) -> int:
+        """
+        Write a new model segment and make it current; returns its generation.
+        With if_empty, nothing is written (and 0 returned) once any model has
+        been published, so only the first worker to start publishes its model.
+        """
+        import fcntl
+
+        with open(f"{self.prefix}.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            previous = self.generation
+            if if_empty and previous > 0:
+                return 0
+            generation = previous + 1
+            # The segment is complete (written + renamed) before anyone can see its generation
+            save_artifact(self._segment_path(generation), engine, metadata)
+            self._set_generation(generation)
+            if previous > 0:
+                history = self._read_history() + [previous]
+                for dropped in history[:-self.max_history]:
+                    self._remove(self._segment_path(dropped))
+                self._write_history(history[-self.max_history:])
+        return generation
+
+    def rollback(self) -> Tuple[CompiledForest, Dict[str, Any], int]:
+        """
+        Make the model that was current before the last publish current again,
+        as a new generation; raises ValueError when there is none
+        """
+        import fcntl
+
+        with open(f"{self.prefix}.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            history = self._read_history()
+            if not history:
+                raise ValueError("No previous model to roll back to")
+            restored = history.pop()
+            current = self.generation
+            generation = current + 1
+            os.replace(self._segment_path(restored), self._segment_path(generation))
+            self._set_generation(generation)
+            self._remove(self._segment_path(current))
+            self._write_history(history)
+            engine, metadata = load_artifact(self._segment_path(generation))
+        return engine, metadata, generation
+
+    def load(self) -> Optional[Tuple[CompiledForest, Dict[str, Any], int]]:
+        """Map the current model, or return None if nothing has been published"""
+        while True:
+            generation = self.generation
+            if generation == 0:
+                return None
+            try:
+                engine, metadata = load_artifact(self._segment_path(generation))
+                return engine, metadata, generation
+            except FileNotFoundError:
+                # Replaced between reading the generation and opening the segment
+                if self.generation == generation:
+                    raise
+
+    def unlink(self) -> None:
+        """Remove every file of the store; called by the supervisor on shutdown"""
+        paths = [self.control_path, f"{self.prefix}.lock", self._history_path()]
+        paths += [self._segment_path(generation) for generation in self._read_history()]
+        if self.generation > 0:
+            paths.append(self._segment_path(self.generation))
+        for path in paths:
+            self._remove(path)
+        shutil.rmtree(self.state_dir, ignore_errors=True)
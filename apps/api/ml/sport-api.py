@@ -1,9 +1,64 @@
+import asyncio
+import functools
+import inspect
 import os
-import requests
-from typing import List, Dict, Optional, Any
+import time
+import httpx
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 from datetime import datetime
 from bs4 import BeautifulSoup
 import re
+import threading
+from upstream_cache import AsyncUpstreamCache
+
+NFL_RAPIDAPI_URL = "https://api-american-football.p.rapidapi.com/games?league=1&season=2025"
+NBA_RAPIDAPI_URL = "https://api-basketball.p.rapidapi.com/games?league=12&season=2024-2025"
+MLB_RAPIDAPI_URL = "https://api-baseball.p.rapidapi.com/games?league=1&season=2025"
+SOCCER_URL = "https://api.football-data.org/v4/competitions/PL/matches"
+ESPN_NFL_URL = "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard"
+ESPN_NBA_URL = "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard"
+ESPN_MLB_URL = "https://site.api.espn.com/apis/site/v2/sports/baseball/mlb/scoreboard"
+
+# Seconds a cached upstream response stays fresh, per source
+CACHE_TTL_SECONDS = {"rapidapi": 120.0, "football-data": 120.0, "espn": 60.0, "odds": 300.0}
+# Scoreboards with a match in progress go stale much sooner
+LIVE_CACHE_TTL_SECONDS = 15.0
+LIVE_STATUS = re.compile(r"^(in[ _]play|in progress|live|paused|halftime|end of period|ht|ot|bt|q[1-4]|in\d+)$", re.I)
+
+ODDS_SPORT_KEYS = {
+    "NFL": "americanfootball_nfl",
+    "NBA": "basketball_nba",
+    "MLB": "baseball_mlb",
+    "SOCCER": "soccer_epl"
+}
+MYBETS_HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+Origin = Tuple[str, str, int]
+
+
+def _origin(url: httpx.URL) -> Origin:
+    return url.scheme, url.host, url.port or (443 if url.scheme == "https" else 80)
+
+
+def create_async_http_client(pool_size: int = 10, retries: int = 2, keepalive_expiry: float = 60.0) -> httpx.AsyncClient:
+    """
+    Keep-alive client for all upstream calls, keeping up to pool_size idle
+    connections for each of ~8 upstream hosts. httpx cannot cap connections
+    per host; AsyncSportsAPIService._get does, with a semaphore per host. The
+    transport retries failed connections; 429/5xx retries happen in _get too.
+    httpx offers gzip and deflate (br and zstd when installed) by default.
+    """
+    limits = httpx.Limits(
+        max_connections=None,
+        # httpx caps keep-alive connections per client, not per host: allow pool_size for each of ~8 upstreams
+        max_keepalive_connections=pool_size * 8,
+        keepalive_expiry=keepalive_expiry
+    )
+    transport = httpx.AsyncHTTPTransport(limits=limits, retries=retries)
+    return httpx.AsyncClient(transport=transport, follow_redirects=True)
 
 
 class LiveMatch:
@@ -74,230 +129,200 @@ class OddsData:
         }
 
 
-class SportsAPIService:
+def cache_ttl(source: str, value: Any) -> float:
+    if any(isinstance(item, LiveMatch) and LIVE_STATUS.match(str(item.status)) for item in value):
+        return LIVE_CACHE_TTL_SECONDS
+    return CACHE_TTL_SECONDS[source]
+
+
+def cached(source: str):
+    """Serve a coroutine fetcher through the service's AsyncUpstreamCache, keyed by method name and arguments"""
+    def decorate(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            if self.cache is None:
+                return await method(self, *args, **kwargs)
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            return await self.cache.get(
+                key, lambda: method(self, *args, **kwargs), functools.partial(cache_ttl, source)
+            )
+        return wrapper
+    return decorate
+
+
+class BaseSportsAPIService:
+    """
+    Everything but the HTTP calls: credentials, request building, response
+    formatting and the health snapshot.
+    """
+
     def __init__(
         self,
         rapidapi_key: Optional[str] = None,
         odds_api_key: Optional[str] = None,
-        football_data_api_key: Optional[str] = None
+        football_data_api_key: Optional[str] = None,
+        fetch_deadline: float = 8.0,
+        health_timeout: float = 3.0,
+        health_ttl: float = 180.0
     ):
         self.rapidapi_key = rapidapi_key
         self.odds_api_key = odds_api_key
         self.football_data_api_key = football_data_api_key
+        # Overall budget for fetch_live_matches_report; slower providers are reported, not awaited
+        self.fetch_deadline = fetch_deadline
+        # Per-probe timeout, and how long a health snapshot may be served before it is refreshed inline
+        self.health_timeout = health_timeout
+        self.health_ttl = health_ttl
+        self._health_snapshot: Optional[Dict[str, Any]] = None
+
+    def _rapidapi_headers(self, url: str) -> Dict[str, str]:
+        return {
+            "X-RapidAPI-Key": self.rapidapi_key,
+            "X-RapidAPI-Host": url.split("/")[2]
+        }
 
-    def fetch_nfl_matches(self) -> List[LiveMatch]:
-        if not self.rapidapi_key:
-            raise ValueError("RapidAPI key required for NFL data")
-
-        try:
-            response = requests.get(
-                "https://api-american-football.p.rapidapi.com/games?league=1&season=2025",
-                headers={
-                    "X-RapidAPI-Key": self.rapidapi_key,
-                    "X-RapidAPI-Host": "api-american-football.p.rapidapi.com"
-                },
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
-            return self._format_nfl_data(data)
-        except Exception as e:
-            print(f"NFL API fetch error: {e}")
-            raise
-
-    def fetch_nba_matches(self) -> List[LiveMatch]:
-        if not self.rapidapi_key:
-            raise ValueError("RapidAPI key required for NBA data")
-
-        try:
-            response = requests.get(
-                "https://api-basketball.p.rapidapi.com/games?league=12&season=2024-2025",
-                headers={
-                    "X-RapidAPI-Key": self.rapidapi_key,
-                    "X-RapidAPI-Host": "api-basketball.p.rapidapi.com"
-                },
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
-            return self._format_nba_data(data)
-        except Exception as e:
-            print(f"NBA API fetch error: {e}")
-            raise
-
-    def fetch_mlb_matches(self) -> List[LiveMatch]:
-        if not self.rapidapi_key:
-            raise ValueError("RapidAPI key required for MLB data")
-
-        try:
-            response = requests.get(
-                "https://api-baseball.p.rapidapi.com/games?league=1&season=2025",
-                headers={
-                    "X-RapidAPI-Key": self.rapidapi_key,
-                    "X-RapidAPI-Host": "api-baseball.p.rapidapi.com"
-                },
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
-            return self._format_mlb_data(data)
-        except Exception as e:
-            print(f"MLB API fetch error: {e}")
-            raise
-
-    def fetch_soccer_matches(self) -> List[LiveMatch]:
-        if not self.football_data_api_key:
-            raise ValueError("Football-Data.org API key required for soccer data")
-
-        try:
-            response = requests.get(
-                "https://api.football-data.org/v4/competitions/PL/matches",
-                headers={"X-Auth-Token": self.football_data_api_key},
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
-            return self._format_soccer_data(data)
-        except Exception as e:
-            print(f"Soccer API fetch error: {e}")
-            raise
-
-    def fetch_espn_nfl(self) -> List[LiveMatch]:
-        try:
-            response = requests.get(
-                "https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard",
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
-            return self._format_espn_data(data, "NFL")
-        except Exception as e:
-            print(f"ESPN NFL API fetch error: {e}")
-            raise
-
-    def fetch_espn_nba(self) -> List[LiveMatch]:
-        try:
-            response = requests.get(
-                "https://site.api.espn.com/apis/site/v2/sports/basketball/nba/scoreboard",
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
-            return self._format_espn_data(data, "NBA")
-        except Exception as e:
-            print(f"ESPN NBA API fetch error: {e}")
-            raise
+    def live_match_sources(self) -> List[Tuple[str, str, Optional[Callable[[], List[LiveMatch]]]]]:
+        """(sport, source, fetcher) per sport; fetcher is None when no source is configured"""
+        if self.rapidapi_key:
+            sources = [
+                ("NFL", "rapidapi", self.fetch_nfl_matches),
+                ("NBA", "rapidapi", self.fetch_nba_matches),
+                ("MLB", "rapidapi", self.fetch_mlb_matches),
+            ]
+        else:
+            sources = [
+                ("NFL", "espn", self.fetch_espn_nfl),
+                ("NBA", "espn", self.fetch_espn_nba),
+                ("MLB", "espn", self.fetch_espn_mlb),
+            ]
+        sources.append(
+            ("Soccer", "football-data", self.fetch_soccer_matches if self.football_data_api_key else None)
+        )
+        return sources
+
+    def _health_probes(self) -> List[Tuple[str, str, Dict[str, str], Optional[str]]]:
+        """(service name, URL, headers, error when the service is not configured)"""
+        rapidapi_missing = None if self.rapidapi_key else "RapidAPI key required"
+        return [
+            ("RapidAPI NFL", NFL_RAPIDAPI_URL, self._rapidapi_headers(NFL_RAPIDAPI_URL), rapidapi_missing),
+            ("RapidAPI NBA", NBA_RAPIDAPI_URL, self._rapidapi_headers(NBA_RAPIDAPI_URL), rapidapi_missing),
+            ("RapidAPI MLB", MLB_RAPIDAPI_URL, self._rapidapi_headers(MLB_RAPIDAPI_URL), rapidapi_missing),
+            ("Soccer API", SOCCER_URL, {"X-Auth-Token": self.football_data_api_key or ""},
+             None if self.football_data_api_key else "Football-Data.org API key required"),
+            ("ESPN NFL (Free)", ESPN_NFL_URL, {}, None),
+            ("ESPN NBA (Free)", ESPN_NBA_URL, {}, None),
+            ("ESPN MLB (Free)", ESPN_MLB_URL, {}, None),
+        ]
 
-    def fetch_espn_mlb(self) -> List[LiveMatch]:
-        try:
-            response = requests.get(
-                "https://site.api.espn.com/apis/site/v2/sports/baseball/mlb/scoreboard",
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
-            return self._format_espn_data(data, "MLB")
-        except Exception as e:
-            print(f"ESPN MLB API fetch error: {e}")
-            raise
+    def cached_health(self) -> Optional[Dict[str, Any]]:
+        """The latest snapshot unless it is missing or older than health_ttl; never blocks"""
+        snapshot = self._health_snapshot
+        if snapshot is None or time.monotonic() - snapshot["monotonic"] > self.health_ttl:
+            return None
+        return snapshot
 
-    def fetch_odds_data(self, sport: str, bookmaker: Optional[str] = None) -> List[OddsData]:
-        """
-        Fetch betting odds with optional bookmaker filtering
-        Args:
-            sport: Sport type (NFL, NBA, MLB)
-            bookmaker: Optional specific bookmaker to filter (e.g., 'draftkings', 'fanduel')
-        """
+    def _odds_request(self, sport: str, bookmaker: Optional[str]) -> Tuple[str, Dict[str, str]]:
         if not self.odds_api_key:
             raise ValueError("The Odds API key required for betting odds")
 
-        sport_keys = {
-            "NFL": "americanfootball_nfl",
-            "NBA": "basketball_nba",
-            "MLB": "baseball_mlb",
-            "SOCCER": "soccer_epl"
-        }
-
-        sport_key = sport_keys.get(sport.upper())
+        sport_key = ODDS_SPORT_KEYS.get(sport.upper())
         if not sport_key:
             raise ValueError(f"Unsupported sport for odds: {sport}")
 
-        try:
-            params = {
-                "apiKey": self.odds_api_key,
-                "regions": "us,uk",
-                "markets": "h2h,spreads,totals",
-                "oddsFormat": "decimal"
-            }
-            
-            if bookmaker:
-                params["bookmakers"] = bookmaker
-            
-            response = requests.get(
-                f"https://api.the-odds-api.com/v4/sports/{sport_key}/odds",
-                params=params,
-                timeout=15
-            )
-            response.raise_for_status()
-            
-            # Check remaining quota
-            remaining = response.headers.get('x-requests-remaining')
-            if remaining:
-                print(f"Odds API requests remaining: {remaining}")
-            
-            data = response.json()
-            return self._format_odds_data(data)
-        except requests.Timeout:
-            print(f"Odds API timeout for {sport}")
-            raise Exception(f"Timeout fetching odds for {sport}")
-        except Exception as e:
-            print(f"Odds API fetch error: {e}")
-            raise
+        params = {
+            "apiKey": self.odds_api_key,
+            "regions": "us,uk",
+            "markets": "h2h,spreads,totals",
+            "oddsFormat": "decimal"
+        }
+        if bookmaker:
+            params["bookmakers"] = bookmaker
+        return f"https://api.the-odds-api.com/v4/sports/{sport_key}/odds", params
 
-    def fetch_all_live_matches(self) -> List[LiveMatch]:
-        all_matches = []
+    def _mybetstoday_request(self, min_confidence: int, max_odds: Optional[float], date: str) -> Tuple[str, int]:
+        """Page URL for date, and the confidence threshold after applying max_odds"""
+        # Convert max_odds to min_confidence if provided
+        if max_odds is not None and max_odds > 0:
+            min_confidence = int(100 / max_odds)
         
-        tasks = [
-            ("NFL", lambda: self.fetch_nfl_matches() if self.rapidapi_key else self.fetch_espn_nfl()),
-            ("NBA", lambda: self.fetch_nba_matches() if self.rapidapi_key else self.fetch_espn_nba()),
-            ("MLB", lambda: self.fetch_mlb_matches() if self.rapidapi_key else self.fetch_espn_mlb()),
-            ("Soccer", self.fetch_soccer_matches if self.football_data_api_key else None),
-        ]
-
-        for sport, fetch_func in tasks:
-            if fetch_func:
-                try:
-                    matches = fetch_func()
-                    all_matches.extend(matches)
-                except Exception as e:
-                    print(f"Failed to fetch {sport} data: {e}")
-
-        return all_matches
-
-    def check_api_health(self) -> List[Dict[str, str]]:
-        checks = [
-            {"name": "RapidAPI NFL", "test": self.fetch_nfl_matches},
-            {"name": "RapidAPI NBA", "test": self.fetch_nba_matches},
-            {"name": "RapidAPI MLB", "test": self.fetch_mlb_matches},
-            {"name": "Soccer API", "test": self.fetch_soccer_matches},
-            {"name": "ESPN NFL (Free)", "test": self.fetch_espn_nfl},
-            {"name": "ESPN NBA (Free)", "test": self.fetch_espn_nba},
-            {"name": "ESPN MLB (Free)", "test": self.fetch_espn_mlb},
-        ]
-
-        results = []
-        for check in checks:
-            try:
-                check["test"]()
-                results.append({"service": check["name"], "status": "healthy"})
-            except Exception as e:
-                results.append({
-                    "service": check["name"],
-                    "status": "unhealthy",
-                    "error": str(e)
-                })
-
-        return results
+        # Build URL based on date parameter
+        if date.lower() == "today" or date == "":
+            url = "https://www.mybets.today/recommended-soccer-predictions/"
+        elif date.lower() == "tomorrow":
+            url = "https://www.mybets.today/recommended-soccer-predictions/tomorrow/"
+        else:
+            # For specific dates, format as needed (e.g., YYYY-MM-DD)
+            url = f"https://www.mybets.today/recommended-soccer-predictions/{date}/"
+        return url, min_confidence
+
+    def _parse_mybetstoday(self, html: str, min_confidence: int) -> List[Dict[str, Any]]:
+        soup = BeautifulSoup(html, 'lxml')
+        predictions = []
+
+        for link in soup.find_all('a', href=True):
+            href = link.get('href', '')
+            if href and 'match-prediction-analysis' in href:
+                text = link.get_text(strip=True)
+
+                confidence_match = re.search(r'\((\d+)%\)', text)
+                if confidence_match:
+                    confidence = int(confidence_match.group(1))
+
+                    if confidence >= min_confidence:
+                        time_match = re.search(r'(\d+:\d+)', text)
+                        game_time = time_match.group(1) if time_match else "Unknown"
+
+                        text_no_time = re.sub(r'^\d+:\d+', '', text)
+
+                        vs_match = re.search(r'\s*[Vv]s\s*', text_no_time)
+                        if vs_match:
+                            before_vs = text_no_time[:vs_match.start()]
+                            after_vs = text_no_time[vs_match.end():]
+
+                            home_team = before_vs.strip()
+
+                            desc_start_match = re.search(
+                                r'(' + re.escape(before_vs.strip()) + r'|' + r'[A-Z][a-z]+\s+(have|won|will|excellent|Despite|Having|We\s+expect))',
+                                after_vs
+                            )
+
+                            if desc_start_match:
+                                away_team = after_vs[:desc_start_match.start()].strip()
+                            else:
+                                away_team = after_vs.strip()
+
+                            if home_team and away_team:
+                                predictions.append({
+                                    "homeTeam": home_team,
+                                    "awayTeam": away_team,
+                                    "matchTime": game_time,
+                                    "prediction": "Win",
+                                    "confidence": confidence,
+                                    "odds": round(100 / confidence, 2) if confidence > 0 else 0,
+                                    "league": "Soccer",
+                                    "sport": "Soccer",
+                                    "source": "MyBetsToday",
+                                    "url": href
+                                })
+
+        return predictions
+
+    def _store_health(self, services: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Summarise health check results and make them the current snapshot"""
+        healthy_count = sum(1 for h in services if h["status"] == "healthy")
+        total_count = len(services)
+        snapshot = {
+            "summary": {
+                "healthy": healthy_count,
+                "total": total_count,
+                "percentage": round((healthy_count / total_count) * 100, 2) if total_count > 0 else 0
+            },
+            "services": services,
+            "checked_at": datetime.now().isoformat(),
+            "monotonic": time.monotonic()
+        }
+        self._health_snapshot = snapshot
+        return snapshot
 
     def _format_nfl_data(self, api_data: Dict) -> List[LiveMatch]:
         if "response" not in api_data:
@@ -442,103 +467,393 @@ class SportsAPIService:
                 ))
         return odds_list
 
-    def fetch_mybetstoday_predictions(self, min_confidence: int = 86, max_odds: Optional[float] = None, date: str = "today") -> List[Dict[str, Any]]:
+
+class AsyncSportsAPIService(BaseSportsAPIService):
+    """
+    Sports data for the event loop: every fetcher is a coroutine on one
+    pooled httpx.AsyncClient, so a single worker keeps serving other clients
+    while upstream calls are in flight. Fetchers marked @cached share
+    responses through an AsyncUpstreamCache. Call aclose() on shutdown.
+    """
+
+    def __init__(
+        self,
+        rapidapi_key: Optional[str] = None,
+        odds_api_key: Optional[str] = None,
+        football_data_api_key: Optional[str] = None,
+        fetch_deadline: float = 8.0,
+        health_timeout: float = 3.0,
+        health_ttl: float = 180.0,
+        http: Optional[httpx.AsyncClient] = None,
+        probe_http: Optional[httpx.AsyncClient] = None,
+        pool_size: int = 10,
+        retries: int = 2,
+        backoff: float = 0.3,
+        backoff_max: float = 2.0,
+        cache_enabled: bool = True,
+        cache_stale_window: float = 300.0,
+        cache_max_stale: float = 3600.0
+    ):
+        super().__init__(rapidapi_key, odds_api_key, football_data_api_key, fetch_deadline, health_timeout, health_ttl)
+        # One pooled keep-alive client shared by every fetcher (see create_async_http_client)
+        self.http = http or create_async_http_client(pool_size=pool_size, retries=retries)
+        self.probe_http = probe_http or create_async_http_client(pool_size=2, retries=0)
+        for client in (self.http, self.probe_http):
+            client.event_hooks["request"].append(self._count_request)
+        self._requests: Dict[Origin, int] = {}
+        # At most pool_size requests in flight per upstream host, so one slow provider cannot open unbounded sockets
+        self.pool_size = pool_size
+        self._host_slots: Dict[Origin, asyncio.Semaphore] = {}
+        self._in_flight: Dict[Origin, int] = {}
+        self._peak_in_flight: Dict[Origin, int] = {}
+        self.retries = retries
+        self.backoff = backoff
+        # Longest wait before a retry; a longer Retry-After gives up so the cache can serve its last good value
+        self.backoff_max = backoff_max
+        self.cache = AsyncUpstreamCache(
+            stale_window=cache_stale_window, max_stale=cache_max_stale
+        ) if cache_enabled else None
+        self._health_lock = asyncio.Lock()
+        # Providers that missed a fetch deadline, still running so their result reaches the cache
+        self._stragglers: Set[asyncio.Task] = set()
+
+    async def _count_request(self, request: httpx.Request) -> None:
+        origin = _origin(request.url)
+        self._requests[origin] = self._requests.get(origin, 0) + 1
+
+    async def _bounded_get(self, origin: Origin, url: str, **kwargs) -> httpx.Response:
+        slots = self._host_slots.get(origin)
+        if slots is None:
+            slots = self._host_slots[origin] = asyncio.Semaphore(self.pool_size)
+        async with slots:
+            in_flight = self._in_flight[origin] = self._in_flight.get(origin, 0) + 1
+            self._peak_in_flight[origin] = max(self._peak_in_flight.get(origin, 0), in_flight)
+            try:
+                return await self.http.get(url, **kwargs)
+            finally:
+                self._in_flight[origin] -= 1
+
+    async def _get(self, url: str, **kwargs) -> httpx.Response:
+        """
+        GET retried on 429/5xx with exponential backoff of at most backoff_max
+        seconds. A Retry-After longer than that returns the failed response
+        instead of waiting. Each attempt holds one of the host's pool_size
+        slots; backoff sleeps do not.
         """
-        Fetch soccer predictions from mybets.today with flexible filtering
+        origin = _origin(httpx.URL(url))
+        for attempt in range(self.retries + 1):
+            response = await self._bounded_get(origin, url, **kwargs)
+            if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                return response
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit() and float(retry_after) > self.backoff_max:
+                return response
+            await asyncio.sleep(float(retry_after) if retry_after.isdigit() else min(self.backoff * 2 ** attempt, self.backoff_max))
+
+    async def _fetch_json(self, name: str, url: str, **kwargs) -> Any:
+        try:
+            response = await self._get(url, timeout=10, **kwargs)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            print(f"{name} API fetch error: {e}")
+            raise
+
+    @cached("rapidapi")
+    async def fetch_nfl_matches(self) -> List[LiveMatch]:
+        if not self.rapidapi_key:
+            raise ValueError("RapidAPI key required for NFL data")
+        data = await self._fetch_json("NFL", NFL_RAPIDAPI_URL, headers=self._rapidapi_headers(NFL_RAPIDAPI_URL))
+        return self._format_nfl_data(data)
+
+    @cached("rapidapi")
+    async def fetch_nba_matches(self) -> List[LiveMatch]:
+        if not self.rapidapi_key:
+            raise ValueError("RapidAPI key required for NBA data")
+        data = await self._fetch_json("NBA", NBA_RAPIDAPI_URL, headers=self._rapidapi_headers(NBA_RAPIDAPI_URL))
+        return self._format_nba_data(data)
+
+    @cached("rapidapi")
+    async def fetch_mlb_matches(self) -> List[LiveMatch]:
+        if not self.rapidapi_key:
+            raise ValueError("RapidAPI key required for MLB data")
+        data = await self._fetch_json("MLB", MLB_RAPIDAPI_URL, headers=self._rapidapi_headers(MLB_RAPIDAPI_URL))
+        return self._format_mlb_data(data)
+
+    @cached("football-data")
+    async def fetch_soccer_matches(self) -> List[LiveMatch]:
+        if not self.football_data_api_key:
+            raise ValueError("Football-Data.org API key required for soccer data")
+        data = await self._fetch_json("Soccer", SOCCER_URL, headers={"X-Auth-Token": self.football_data_api_key})
+        return self._format_soccer_data(data)
+
+    @cached("espn")
+    async def fetch_espn_nfl(self) -> List[LiveMatch]:
+        return self._format_espn_data(await self._fetch_json("ESPN NFL", ESPN_NFL_URL), "NFL")
+
+    @cached("espn")
+    async def fetch_espn_nba(self) -> List[LiveMatch]:
+        return self._format_espn_data(await self._fetch_json("ESPN NBA", ESPN_NBA_URL), "NBA")
+
+    @cached("espn")
+    async def fetch_espn_mlb(self) -> List[LiveMatch]:
+        return self._format_espn_data(await self._fetch_json("ESPN MLB", ESPN_MLB_URL), "MLB")
+
+    @cached("odds")
+    async def fetch_odds_data(self, sport: str, bookmaker: Optional[str] = None) -> List[OddsData]:
+        """
+        Fetch betting odds with optional bookmaker filtering
+        Args:
+            sport: Sport type (NFL, NBA, MLB)
+            bookmaker: Optional specific bookmaker to filter (e.g., 'draftkings', 'fanduel')
+        """
+        url, params = self._odds_request(sport, bookmaker)
+        try:
+            response = await self._get(url, params=params, timeout=15)
+            response.raise_for_status()
+
+            remaining = response.headers.get('x-requests-remaining')
+            if remaining:
+                print(f"Odds API requests remaining: {remaining}")
+            return self._format_odds_data(response.json())
+        except httpx.TimeoutException:
+            print(f"Odds API timeout for {sport}")
+            raise Exception(f"Timeout fetching odds for {sport}")
+        except Exception as e:
+            print(f"Odds API fetch error: {e}")
+            raise
+
+    def http_stats(self) -> Dict[str, Any]:
+        """
+        Per upstream host: requests sent (counted as they leave the clients,
+        probes included), and fetches in flight now and at peak against the
+        pool_size limit
+        """
+        hosts = {}
+        for origin in set(self._requests) | set(self._in_flight):
+            scheme, host, port = origin
+            hosts[f"{scheme}://{host}:{port}"] = {
+                "requests": self._requests.get(origin, 0),
+                "in_flight": self._in_flight.get(origin, 0),
+                "peak_in_flight": self._peak_in_flight.get(origin, 0)
+            }
+        return {
+            "accept_encoding": self.http.headers.get("Accept-Encoding"),
+            "max_connections_per_host": self.pool_size,
+            "hosts": hosts
+        }
+
+    async def fetch_live_matches_report(self, deadline: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Fetch every sport concurrently, waiting at most deadline seconds
+        (default: fetch_deadline) in total, so latency tracks the slowest
+        provider rather than the sum of all of them. Returns the matches that
+        arrived in time, a status per sport ("ok", "error", "timeout" or
+        "skipped") and whether the result is partial. A provider that misses
+        the deadline keeps running in the background so its result reaches
+        the cache.
+        """
+        deadline = self.fetch_deadline if deadline is None else deadline
+        started = time.perf_counter()
+
+        tasks = {}
+        sources: Dict[str, Dict[str, Any]] = {}
+        for sport, source, fetch_func in self.live_match_sources():
+            if fetch_func is None:
+                sources[sport] = {"source": source, "status": "skipped", "count": 0, "error": "No API key configured"}
+            else:
+                sources[sport] = {"source": source}
+                tasks[sport] = (source, asyncio.ensure_future(self._timed_fetch(fetch_func)))
+        done = set()
+        if tasks:
+            done, _ = await asyncio.wait([task for _, task in tasks.values()], timeout=deadline)
+
+        all_matches = []
+        for sport, (source, task) in tasks.items():
+            if task not in done:
+                self._stragglers.add(task)
+                task.add_done_callback(self._straggler_done)
+                print(f"{sport} data missed the {deadline}s deadline")
+                sources[sport] = {
+                    "source": source, "status": "timeout", "count": 0,
+                    "error": f"No response within {deadline}s"
+                }
+                continue
+            try:
+                matches, elapsed = task.result()
+            except Exception as e:
+                print(f"Failed to fetch {sport} data: {e}")
+                sources[sport] = {"source": source, "status": "error", "count": 0, "error": str(e)}
+                continue
+            all_matches.extend(matches)
+            sources[sport] = {
+                "source": source, "status": "ok", "count": len(matches), "elapsed_ms": round(elapsed * 1000, 1)
+            }
+
+        return {
+            "matches": all_matches,
+            "sources": sources,
+            "partial": any(s["status"] in ("error", "timeout") for s in sources.values()),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+        }
+
+    def _straggler_done(self, task: asyncio.Task) -> None:
+        self._stragglers.discard(task)
+        if not task.cancelled():
+            task.exception()
+
+    @staticmethod
+    async def _timed_fetch(fetch_func: Callable[[], Any]) -> Tuple[List[LiveMatch], float]:
+        started = time.perf_counter()
+        return await fetch_func(), time.perf_counter() - started
+
+    async def fetch_all_live_matches(self, deadline: Optional[float] = None) -> List[LiveMatch]:
+        return (await self.fetch_live_matches_report(deadline))["matches"]
+
+    async def _probe(self, url: str, headers: Dict[str, str], timeout: float) -> float:
+        """Status line and headers only: the response body is never downloaded or parsed"""
+        started = time.perf_counter()
+        async with self.probe_http.stream("GET", url, headers=headers, timeout=timeout) as response:
+            response.raise_for_status()
+        return time.perf_counter() - started
+
+    async def check_api_health(self, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Probe every upstream concurrently, each with a timeout of at most
+        timeout seconds (default: health_timeout). Unconfigured services are
+        reported unhealthy without a request.
+        """
+        timeout = self.health_timeout if timeout is None else timeout
+        probes = []
+        for name, url, headers, missing in self._health_probes():
+            task = None if missing else asyncio.ensure_future(self._probe(url, headers, timeout))
+            probes.append((name, missing, task))
+        tasks = [task for _, _, task in probes if task is not None]
+        if tasks:
+            # Connect and read timeouts apply separately, so allow both before giving up on a probe
+            await asyncio.wait(tasks, timeout=2 * timeout)
+
+        results = []
+        for name, missing, task in probes:
+            if task is None:
+                results.append({"service": name, "status": "unhealthy", "error": missing})
+            elif not task.done():
+                task.cancel()
+                results.append({"service": name, "status": "unhealthy", "error": f"No response within {timeout}s"})
+            elif task.exception() is not None:
+                results.append({"service": name, "status": "unhealthy", "error": str(task.exception())})
+            else:
+                results.append({"service": name, "status": "healthy", "latency_ms": round(task.result() * 1000, 1)})
+        return results
+
+    async def refresh_health(self) -> Dict[str, Any]:
+        """Run the health checks and store the result as the current snapshot"""
+        async with self._health_lock:
+            return self._store_health(await self.check_api_health())
+
+    async def health_snapshot(self) -> Dict[str, Any]:
+        """
+        The latest snapshot, normally kept fresh by a background refresher.
+        Only when there is none yet, or it is older than health_ttl, are the
+        checks run inline, and concurrent callers share that one run.
+        """
+        snapshot = self.cached_health()
+        if snapshot is not None:
+            return snapshot
+        async with self._health_lock:
+            return self.cached_health() or self._store_health(await self.check_api_health())
+
+    async def fetch_mybetstoday_predictions(self, min_confidence: int = 86, max_odds: Optional[float] = None, date: str = "today") -> List[Dict[str, Any]]:
+        """
+        Fetch soccer predictions from mybets.today with flexible filtering;
+        the page is parsed in a worker thread
         Args:
             min_confidence: Minimum confidence percentage (default 86 for odds <= 1.16)
             max_odds: Optional maximum odds filter (overrides min_confidence if set)
             date: Date filter - "today", "tomorrow", or specific date format (default "today")
         """
-        # Convert max_odds to min_confidence if provided
-        if max_odds is not None and max_odds > 0:
-            min_confidence = int(100 / max_odds)
-        
-        # Build URL based on date parameter
-        if date.lower() == "today" or date == "":
-            url = "https://www.mybets.today/recommended-soccer-predictions/"
-        elif date.lower() == "tomorrow":
-            url = "https://www.mybets.today/recommended-soccer-predictions/tomorrow/"
-        else:
-            # For specific dates, format as needed (e.g., YYYY-MM-DD)
-            url = f"https://www.mybets.today/recommended-soccer-predictions/{date}/"
-        
+        url, min_confidence = self._mybetstoday_request(min_confidence, max_odds, date)
         try:
-            response = requests.get(
-                url,
-                headers={
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                },
-                timeout=10
-            )
+            response = await self._get(url, headers=MYBETS_HEADERS, timeout=10)
             response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'lxml')
-            predictions = []
-            
-            for link in soup.find_all('a', href=True):
-                href = link.get('href', '')
-                if href and 'match-prediction-analysis' in href:
-                    text = link.get_text(strip=True)
-                    
-                    confidence_match = re.search(r'\((\d+)%\)', text)
-                    if confidence_match:
-                        confidence = int(confidence_match.group(1))
-                        
-                        if confidence >= min_confidence:
-                            time_match = re.search(r'(\d+:\d+)', text)
-                            game_time = time_match.group(1) if time_match else "Unknown"
-                            
-                            text_no_time = re.sub(r'^\d+:\d+', '', text)
-                            
-                            vs_match = re.search(r'\s*[Vv]s\s*', text_no_time)
-                            if vs_match:
-                                before_vs = text_no_time[:vs_match.start()]
-                                after_vs = text_no_time[vs_match.end():]
-                                
-                                home_team = before_vs.strip()
-                                
-                                desc_start_match = re.search(
-                                    r'(' + re.escape(before_vs.strip()) + r'|' + r'[A-Z][a-z]+\s+(have|won|will|excellent|Despite|Having|We\s+expect))',
-                                    after_vs
-                                )
-                                
-                                if desc_start_match:
-                                    away_team = after_vs[:desc_start_match.start()].strip()
-                                else:
-                                    away_team = after_vs.strip()
-                                
-                                if home_team and away_team:
-                                    predictions.append({
-                                        "homeTeam": home_team,
-                                        "awayTeam": away_team,
-                                        "matchTime": game_time,
-                                        "prediction": "Win",
-                                        "confidence": confidence,
-                                        "odds": round(100 / confidence, 2) if confidence > 0 else 0,
-                                        "league": "Soccer",
-                                        "sport": "Soccer",
-                                        "source": "MyBetsToday",
-                                        "url": href
-                                    })
-            
-            return predictions
-            
+            return await asyncio.to_thread(self._parse_mybetstoday, response.text, min_confidence)
         except Exception as e:
             print(f"Error fetching MyBetsToday predictions: {e}")
             return []
 
-
-def create_sports_api_service() -> SportsAPIService:
-    """Factory function to create SportsAPIService with environment variables"""
-    import os
-    return SportsAPIService(
+    async def aclose(self) -> None:
+        """Cancel background fetches and close the HTTP clients"""
+        for task in list(self._stragglers):
+            task.cancel()
+        if self.cache is not None:
+            self.cache.cancel()
+        await self.http.aclose()
+        await self.probe_http.aclose()
+
+
+def create_async_sports_api_service() -> AsyncSportsAPIService:
+    """Factory function to create AsyncSportsAPIService with environment variables"""
+    retries = int(os.getenv("SPORTS_HTTP_RETRIES", 2))
+    pool_size = int(os.getenv("SPORTS_HTTP_POOL_SIZE", 10))
+    return AsyncSportsAPIService(
         rapidapi_key=os.getenv("RAPIDAPI_KEY"),
         odds_api_key=os.getenv("ODDS_API_KEY"),
-        football_data_api_key=os.getenv("FOOTBALL_DATA_API_KEY")
+        football_data_api_key=os.getenv("FOOTBALL_DATA_API_KEY"),
+        fetch_deadline=float(os.getenv("SPORTS_API_DEADLINE_SECONDS", 8)),
+        health_timeout=float(os.getenv("SPORTS_HEALTH_TIMEOUT_SECONDS", 3)),
+        health_ttl=float(os.getenv("SPORTS_HEALTH_TTL_SECONDS", 180)),
+        http=create_async_http_client(pool_size=pool_size, retries=retries),
+        pool_size=pool_size,
+        retries=retries,
+        backoff=float(os.getenv("SPORTS_HTTP_BACKOFF_SECONDS", 0.3)),
+        backoff_max=float(os.getenv("SPORTS_HTTP_BACKOFF_MAX_SECONDS", 2)),
+        cache_enabled=os.getenv("SPORTS_CACHE_ENABLED", "true").lower() == "true",
+        cache_stale_window=float(os.getenv("SPORTS_CACHE_STALE_SECONDS", 300)),
+        cache_max_stale=float(os.getenv("SPORTS_CACHE_MAX_STALE_SECONDS", 3600))
     )
 
 
+class SportsAPIService:
+    """
+    Blocking facade over AsyncSportsAPIService for scripts and other
+    non-async callers. Its coroutine methods (fetchers, check_api_health,
+    health_snapshot, ...) become plain methods that run on the facade's own
+    event loop thread; everything else is the wrapped service's. Call close()
+    when done.
+    """
+
+    def __init__(self, service: Optional[AsyncSportsAPIService] = None, **kwargs):
+        self.service = service or AsyncSportsAPIService(**kwargs)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="sports-api", daemon=True)
+        self._thread.start()
+
+    def _run(self, coro: Awaitable[Any]) -> Any:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.service, name)
+        if not inspect.iscoroutinefunction(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def blocking(*args, **kwargs):
+            return self._run(attr(*args, **kwargs))
+        return blocking
+
+    def close(self) -> None:
+        """Close the wrapped service, then stop the event loop thread"""
+        self._run(self.service.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+def create_sports_api_service() -> SportsAPIService:
+    """Factory function to create a blocking SportsAPIService with environment variables"""
+    return SportsAPIService(create_async_sports_api_service())
+
+
 # Additional helper methods for StatArea and FlashScore
 def fetch_statarea_predictions(
     service: SportsAPIService,
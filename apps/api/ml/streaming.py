@@ -0,0 +1,112 @@
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from starlette.responses import StreamingResponse
+
+
+class StreamRow:
+    __slots__ = ("index", "features", "match_context", "error")
+
+    def __init__(self, index: int, features: Optional[List[float]] = None,
+                 match_context: Optional[Dict[str, str]] = None, error: Optional[str] = None):
+        self.index = index
+        self.features = features
+        self.match_context = match_context
+        self.error = error
+
+
+def parse_row(index: int, line: bytes, features_required: int) -> StreamRow:
+    """A row is either a bare feature array or {"features": [...], "match_context": {...}}"""
+    try:
+        item = json.loads(line)
+    except ValueError as e:
+        return StreamRow(index, error=f"Invalid JSON: {e}")
+
+    match_context = None
+    if isinstance(item, dict):
+        match_context = item.get("match_context")
+        item = item.get("features")
+
+    if not isinstance(item, list) or len(item) != features_required:
+        return StreamRow(index, error=f"Expected {features_required} features")
+    if not all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in item):
+        return StreamRow(index, error="Features must be numbers")
+    return StreamRow(index, features=[float(value) for value in item], match_context=match_context)
+
+
+async def iter_ndjson_chunks(body: AsyncIterator[bytes], chunk_size: int, features_required: int,
+                             max_line_bytes: int = 65536) -> AsyncIterator[List[StreamRow]]:
+    """
+    Split a streamed NDJSON body into lists of at most chunk_size parsed rows.
+    Only the current chunk and one partial line are held in memory, however
+    large the body is. A line longer than max_line_bytes becomes an error row
+    and the rest of it is discarded unread.
+    """
+    buffer = b""
+    rows: List[StreamRow] = []
+    index = 0
+    # Inside an oversized line whose error row is already out
+    skipping = False
+
+    async for data in body:
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        if skipping and lines:
+            lines.pop(0)
+            skipping = False
+        if skipping:
+            buffer = b""
+        elif len(buffer) > max_line_bytes:
+            lines.append(buffer)
+            buffer = b""
+            skipping = True
+        for line in lines:
+            if len(line) > max_line_bytes:
+                row = StreamRow(index, error=f"Line longer than {max_line_bytes} bytes")
+            elif not line.strip():
+                continue
+            else:
+                row = parse_row(index, line, features_required)
+            rows.append(row)
+            index += 1
+            if len(rows) >= chunk_size:
+                yield rows
+                rows = []
+
+    if buffer.strip():
+        rows.append(parse_row(index, buffer, features_required))
+    if rows:
+        yield rows
+
+
+def format_results(rows: List[StreamRow], results: List[Dict[str, Any]]) -> str:
+    """One NDJSON line per input row, in input order; results cover the valid rows"""
+    lines = []
+    valid_results = iter(results)
+    for row in rows:
+        if row.error is not None:
+            lines.append(json.dumps({"index": row.index, "error": row.error}))
+            continue
+        result = next(valid_results)
+        lines.append(json.dumps({
+            "index": row.index,
+            "prediction": result["prediction"],
+            "confidence": result["confidence"] * 100,
+            "probabilities": {k: v * 100 for k, v in result["probabilities"].items()},
+            "match_context": row.match_context
+        }))
+    return "\n".join(lines) + "\n"
+
+
+class RequestStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that leaves receive() alone. The stock response listens
+    for http.disconnect on receive() while streaming, which swallows the body
+    messages a generator still reading request.stream() is waiting for.
+    Background tasks run once the body is sent, as with StreamingResponse.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from predictionModel import MagajiCoMLPredictor
+
+
+@pytest.fixture
+def predictor(tmp_path):
+    # No model on disk, so every prediction takes the rule-based fallback
+    predictor = MagajiCoMLPredictor(model_path=str(tmp_path / "model_data.pkl"))
+    assert predictor._active is None
+    return predictor
+
+
+def test_fallback_batch_matches_scalar(predictor):
+    rng = np.random.default_rng(42)
+    matrix = rng.random((500, 7))
+
+    batch = predictor.predict_batch(matrix)
+
+    assert len(batch) == len(matrix)
+    for row, result in zip(matrix.tolist(), batch):
+        assert result == predictor.predict(row)
+
+
+def test_fallback_tie_resolves_to_draw(predictor):
+    features = [0, 0.25, 0.5, 1, 0.5, 0.5, 1]
+
+    scalar = predictor.predict(features)
+    batch = predictor.predict_batch([features])[0]
+
+    probabilities = scalar["probabilities"]
+    assert probabilities["home"] == probabilities["away"] > probabilities["draw"]
+    assert scalar["prediction"] == batch["prediction"] == "draw"
+    assert batch == scalar
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+
+from tree_engine import CompiledForest
+
+
+@pytest.fixture(scope="module")
+def forest():
+    rng = np.random.default_rng(7)
+    X = rng.random((600, 7))
+    y = rng.integers(0, 3, 600)
+    scaler = StandardScaler().fit(X)
+    model = RandomForestClassifier(n_estimators=25, max_depth=8, random_state=42).fit(scaler.transform(X), y)
+    return model, scaler
+
+
+@pytest.fixture(scope="module")
+def rows():
+    return np.random.default_rng(8).random((200, 7))
+
+
+def test_batch_matches_sklearn(forest, rows):
+    model, scaler = forest
+    engine = CompiledForest.from_sklearn(model, scaler)
+
+    assert np.array_equal(engine.predict_proba(rows), model.predict_proba(scaler.transform(rows)))
+
+
+def test_single_row_matches_sklearn(forest, rows):
+    model, scaler = forest
+    engine = CompiledForest.from_sklearn(model, scaler)
+
+    for row in rows:
+        expected = model.predict_proba(scaler.transform(row[np.newaxis, :]))[0]
+        assert np.array_equal(engine.predict_proba_row(row), expected)
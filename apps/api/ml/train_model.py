@@ -1,61 +1,87 @@
 
+import argparse
+import os
+import time
 import numpy as np
 import pickle
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
 import logging
+from tree_engine import CompiledForest
+from model_artifact import save_artifact
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def generate_training_data(n_samples=10000):
-    np.random.seed(42)
-    X = []
-    y = []
-    
-    for _ in range(n_samples):
-        home_strength = np.random.uniform(0.3, 1.0)
-        away_strength = np.random.uniform(0.3, 1.0)
-        home_advantage = np.random.uniform(0.5, 0.8)
-        recent_form_home = np.random.uniform(0.2, 1.0)
-        recent_form_away = np.random.uniform(0.2, 1.0)
-        head_to_head = np.random.uniform(0.3, 0.7)
-        injuries = np.random.uniform(0.4, 1.0)
-        
-        features = [
-            home_strength, away_strength, home_advantage,
-            recent_form_home, recent_form_away, head_to_head, injuries
-        ]
-        
-        home_score = (
-            home_strength * 0.3 +
-            home_advantage * 0.2 +
-            recent_form_home * 0.25 +
-            head_to_head * 0.15 +
-            injuries * 0.1
-        )
-        
-        away_score = (
-            away_strength * 0.3 +
-            (1 - home_advantage) * 0.1 +
-            recent_form_away * 0.25 +
-            (1 - head_to_head) * 0.15 +
-            injuries * 0.2
-        )
-        
-        diff = home_score - away_score
-        if diff > 0.15:
-            label = 0  # home win
-        elif diff < -0.15:
-            label = 2  # away win
-        else:
-            label = 1  # draw
-        
-        X.append(features)
-        y.append(label)
-    
-    return np.array(X), np.array(y)
+# Uniform sampling range per feature, in feature order:
+# home_strength, away_strength, home_advantage, recent_form_home,
+# recent_form_away, head_to_head, injuries
+FEATURE_LOW = np.array([0.3, 0.3, 0.5, 0.2, 0.2, 0.3, 0.4])
+FEATURE_HIGH = np.array([1.0, 1.0, 0.8, 1.0, 1.0, 0.7, 1.0])
+
+def label_matches(X):
+    """Outcome labels (0 home, 1 draw, 2 away) from the MagajiCo scoring rule"""
+    (home_strength, away_strength, home_advantage, recent_form_home,
+     recent_form_away, head_to_head, injuries) = X.T
+
+    home_score = (
+        home_strength * 0.3 +
+        home_advantage * 0.2 +
+        recent_form_home * 0.25 +
+        head_to_head * 0.15 +
+        injuries * 0.1
+    )
+
+    away_score = (
+        away_strength * 0.3 +
+        (1 - home_advantage) * 0.1 +
+        recent_form_away * 0.25 +
+        (1 - head_to_head) * 0.15 +
+        injuries * 0.2
+    )
+
+    diff = home_score - away_score
+    labels = np.ones(len(X), dtype=np.int64)  # draw
+    labels[diff > 0.15] = 0  # home win
+    labels[diff < -0.15] = 2  # away win
+    return labels
+
+def generate_training_data(n_samples=10000, seed=42, rng=None):
+    """
+    (n_samples, 7) feature matrix and labels, drawn in one vectorized call.
+    Pass rng to continue an existing np.random.Generator stream.
+    """
+    rng = rng if rng is not None else np.random.default_rng(seed)
+    X = rng.uniform(FEATURE_LOW, FEATURE_HIGH, size=(n_samples, len(FEATURE_LOW)))
+    return X, label_matches(X)
+
+def generate_training_data_to_disk(directory, n_samples, chunk_size=1_000_000, seed=42):
+    """
+    Write features.npy (float64) and labels.npy (int8) into directory, chunk by
+    chunk through memory-mapped .npy files, so tens of millions of rows never
+    have to fit in memory. The rows are identical to
+    generate_training_data(n_samples, seed).
+    """
+    os.makedirs(directory, exist_ok=True)
+    features_path = os.path.join(directory, "features.npy")
+    labels_path = os.path.join(directory, "labels.npy")
+
+    features = np.lib.format.open_memmap(features_path, mode="w+", dtype=np.float64,
+                                         shape=(n_samples, len(FEATURE_LOW)))
+    labels = np.lib.format.open_memmap(labels_path, mode="w+", dtype=np.int8, shape=(n_samples,))
+
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_samples, chunk_size):
+        stop = min(start + chunk_size, n_samples)
+        X, y = generate_training_data(stop - start, rng=rng)
+        features[start:stop] = X
+        labels[start:stop] = y
+
+    features.flush()
+    labels.flush()
+    del features, labels
+    return features_path, labels_path
 
 def train_model():
     logger.info("🏋️ Starting model training...")
@@ -101,7 +127,27 @@ def train_model():
         pickle.dump(model_data, f)
     
     logger.info("✅ Model saved to model_data.pkl")
+
+    save_artifact("model_data.forest", CompiledForest.from_sklearn(model, scaler), {
+        "accuracy": test_score,
+        "version": model_data["version"],
+        "sklearn_version": model_data["sklearn_version"],
+        "trained_date": model_data["trained_date"]
+    })
+    logger.info("✅ Memory-mapped artifact saved to model_data.forest")
     return model, scaler, test_score
 
 if __name__ == "__main__":
-    train_model()
+    parser = argparse.ArgumentParser(description="Train the model, or write a synthetic dataset to disk")
+    parser.add_argument("--generate", metavar="DIR", help="Write features.npy and labels.npy to DIR instead of training")
+    parser.add_argument("--samples", type=int, default=10_000_000, help="Rows to generate with --generate")
+    parser.add_argument("--chunk-size", type=int, default=1_000_000, help="Rows generated per chunk")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.generate:
+        started = time.perf_counter()
+        paths = generate_training_data_to_disk(args.generate, args.samples, args.chunk_size, args.seed)
+        logger.info(f"✅ Wrote {args.samples} samples to {', '.join(paths)} in {time.perf_counter() - started:.1f}s")
+    else:
+        train_model()
@@ -0,0 +1,277 @@
+import asyncio
+import contextlib
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+from datasets import Dataset, fit_forest_out_of_core
+from executors import PoolSaturated, WorkerPools
+from model_search import search_forest
+from predictionModel import MagajiCoMLPredictor, fit_forest, update_forest
+
+TRAINING_MODES = ("full", "incremental", "search")
+
+
+class TrainingJob:
+    def __init__(self, job_id: str, samples: int, mode: str = "full"):
+        self.id = job_id
+        self.samples = samples
+        self.mode = mode
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        duration = None
+        if self.started_at is not None and self.finished_at is not None:
+            duration = round(self.finished_at - self.started_at, 3)
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "mode": self.mode,
+            "samples": self.samples,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_seconds": duration,
+            "result": self.result,
+            "error": self.error
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TrainingJob":
+        job = cls(data["job_id"], data["samples"], data["mode"])
+        job.status = data["status"]
+        job.created_at = data["created_at"]
+        job.started_at = data["started_at"]
+        job.finished_at = data["finished_at"]
+        job.result = data["result"]
+        job.error = data["error"]
+        return job
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class TrainingJobManager:
+    """
+    Runs /train requests as background jobs.
+    The fit happens in the training process pool; the finished model is then
+    installed through MagajiCoMLPredictor.install_model, which writes the artifact
+    atomically and swaps the active model in one reference assignment.
+    Incremental jobs (update_forest) run one at a time, each starting from the
+    model the previous one installed, so no update is lost. Search jobs
+    (search_forest) fan their candidate fits out over their own process pool.
+    Dataset jobs (fit_forest_out_of_core) read an on-disk dataset chunk by chunk
+    in the training process, so only the dataset's location crosses processes.
+
+    With a state_dir (the shared model store's, in multi-worker mode) every
+    worker writes its jobs there as <job_id>.json, so any worker can report any
+    job, the capacity limit counts the jobs of all workers, and incremental
+    jobs also hold a file lock so they run one at a time across workers.
+    """
+
+    def __init__(self, predictor: MagajiCoMLPredictor, pools: WorkerPools,
+                 on_activate: Optional[Callable[[], None]] = None, max_jobs: int = 100,
+                 state_dir: Optional[str] = None):
+        self.predictor = predictor
+        self.pools = pools
+        self.on_activate = on_activate
+        self.max_jobs = max_jobs
+        self.state_dir = state_dir
+        self._jobs: "OrderedDict[str, TrainingJob]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._update_lock = asyncio.Lock()
+
+    def submit(self, data: List[List[float]], labels: List[int], mode: str = "full",
+               options: Optional[Dict[str, Any]] = None) -> TrainingJob:
+        """
+        mode "full" refits from scratch (fit_forest), "incremental" updates the
+        active model (update_forest with new_trees, max_trees) and "search" runs
+        a hyperparameter search (search_forest with time_budget, min_accuracy,
+        workers). options are passed to the chosen function.
+        """
+        if mode not in TRAINING_MODES:
+            raise ValueError(f"mode must be one of {TRAINING_MODES}")
+        job = self._register(len(data), mode)
+        self._tasks[job.id] = asyncio.create_task(self._run(job, data, labels, options or {}))
+        return job
+
+    def submit_dataset(self, dataset: Dataset, options: Optional[Dict[str, Any]] = None) -> TrainingJob:
+        """Full refit from an on-disk dataset (chunk_size, n_estimators, max_depth options)"""
+        job = self._register(dataset.rows, "dataset")
+        self._tasks[job.id] = asyncio.create_task(self._run_dataset(job, dataset, options or {}))
+        return job
+
+    def _register(self, samples: int, mode: str) -> TrainingJob:
+        with self._file_lock("jobs.lock"):
+            active = sum(1 for job in self._all_jobs() if job["status"] in ("queued", "running"))
+            if active >= self.pools.training.capacity:
+                raise PoolSaturated(f"{active} training jobs already queued or running")
+
+            job = TrainingJob(uuid.uuid4().hex, samples, mode)
+            self._jobs[job.id] = job
+            self._persist(job)
+            self._trim()
+        return job
+
+    def get(self, job_id: str) -> Optional[TrainingJob]:
+        job = self._jobs.get(job_id)
+        if job is None and self.state_dir is not None:
+            data = self._read_job(self._job_path(job_id))
+            if data is not None:
+                job = TrainingJob.from_dict(data)
+        return job
+
+    def _job_path(self, job_id: str) -> str:
+        return os.path.join(self.state_dir, f"{job_id}.json")
+
+    def _persist(self, job: TrainingJob) -> None:
+        if self.state_dir is None:
+            return
+        path = self._job_path(job.id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({**job.to_dict(), "pid": os.getpid()}, f)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read_job(path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _all_jobs(self) -> List[Dict[str, Any]]:
+        """Every worker's jobs (this worker's without a state_dir), oldest first"""
+        if self.state_dir is None:
+            return [job.to_dict() for job in self._jobs.values()]
+        jobs = []
+        for name in os.listdir(self.state_dir):
+            data = self._read_job(os.path.join(self.state_dir, name)) if name.endswith(".json") else None
+            if data is None:
+                continue
+            # A worker that died mid-job never finishes it; stop counting it as live
+            if data["status"] in ("queued", "running") and not _process_alive(data["pid"]):
+                data["status"] = "failed"
+            jobs.append(data)
+        return sorted(jobs, key=lambda data: data["created_at"])
+
+    @contextlib.contextmanager
+    def _file_lock(self, name: str) -> Iterator[None]:
+        """Exclusive lock shared by every worker; a no-op without a state_dir"""
+        if self.state_dir is None:
+            yield
+            return
+        import fcntl
+
+        with open(os.path.join(self.state_dir, name), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    @contextlib.asynccontextmanager
+    async def _exclusive_update(self) -> AsyncIterator[None]:
+        """One incremental job at a time in this worker and, with a state_dir, across workers"""
+        async with self._update_lock:
+            if self.state_dir is None:
+                yield
+                return
+            import fcntl
+
+            with open(os.path.join(self.state_dir, "update.lock"), "a") as lock:
+                await asyncio.to_thread(fcntl.flock, lock, fcntl.LOCK_EX)
+                # Start from the model another worker's update may have just published
+                if self.predictor.sync_shared_model() and self.on_activate is not None:
+                    self.on_activate()
+                yield
+
+    async def _run(self, job: TrainingJob, data: List[List[float]], labels: List[int],
+                   options: Dict[str, Any]) -> None:
+        features_required = self.predictor.features_required
+        try:
+            if job.mode == "incremental":
+                async with self._exclusive_update():
+                    self._start(job)
+                    # Unpickles the sklearn objects if the active model was mapped from its artifact
+                    model, scaler = await self.pools.run_inference(self.predictor.sklearn_model)
+                    trained = await self.pools.run_training(
+                        update_forest, model, scaler, data, labels,
+                        options.get("new_trees", 20), options.get("max_trees", 300), features_required
+                    )
+                    job.result = await self.pools.run_inference(self.predictor.install_model, trained)
+            else:
+                self._start(job)
+                if job.mode == "search":
+                    trained = await self.pools.run_training(
+                        search_forest, data, labels, options.get("time_budget", 60.0),
+                        options.get("min_accuracy"), options.get("workers")
+                    )
+                else:
+                    trained = await self.pools.run_training(fit_forest, data, labels, features_required)
+                job.result = await self.pools.run_inference(self.predictor.install_model, trained)
+                if "search" in trained:
+                    job.result["search"] = trained["search"]
+            self._succeed(job)
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            self._persist(job)
+            self._tasks.pop(job.id, None)
+
+    async def _run_dataset(self, job: TrainingJob, dataset: Dataset, options: Dict[str, Any]) -> None:
+        try:
+            self._start(job)
+            trained = await self.pools.run_training(
+                fit_forest_out_of_core, dataset, options.get("chunk_size", 1_000_000),
+                options.get("n_estimators", 100), options.get("max_depth", 10)
+            )
+            job.result = await self.pools.run_inference(self.predictor.install_model, trained)
+            job.result["dataset"] = trained["dataset"]
+            self._succeed(job)
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            self._persist(job)
+            self._tasks.pop(job.id, None)
+
+    def _succeed(self, job: TrainingJob) -> None:
+        if self.on_activate is not None:
+            self.on_activate()
+        job.status = "succeeded"
+
+    def _start(self, job: TrainingJob) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        self._persist(job)
+
+    def _trim(self) -> None:
+        # Forget the oldest finished jobs beyond max_jobs; never drop live ones
+        for job_id in list(self._jobs):
+            if len(self._jobs) <= self.max_jobs:
+                break
+            if self._jobs[job_id].status in ("succeeded", "failed"):
+                del self._jobs[job_id]
+        if self.state_dir is not None:
+            jobs = self._all_jobs()
+            finished = [data for data in jobs if data["status"] in ("succeeded", "failed")]
+            for data in finished[:max(0, len(jobs) - self.max_jobs)]:
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(self._job_path(data["job_id"]))
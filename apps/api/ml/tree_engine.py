@@ -0,0 +1,119 @@
+import numpy as np
+from typing import Any, Dict
+
+
+class CompiledForest:
+    """
+    Array-backed inference engine for a fitted StandardScaler + RandomForestClassifier.
+
+    The forest is flattened into contiguous node tables so single rows and
+    batches are evaluated with a handful of NumPy gathers per tree level,
+    skipping sklearn's per-call validation and dispatch. Leaves point back to
+    themselves, so every row can walk exactly max_depth levels without masking.
+    Results match predict_proba: rows are scaled in float64, compared in float32
+    like sklearn's trees, and tree outputs are summed in estimator order.
+    """
+
+    def __init__(self, mean: np.ndarray, scale: np.ndarray, feature: np.ndarray,
+                 threshold: np.ndarray, children: np.ndarray, values: np.ndarray,
+                 roots: np.ndarray, max_depth: int, classes: np.ndarray):
+        self.mean = mean
+        self.scale = scale
+        self.feature = feature
+        self.threshold = threshold
+        # children[2 * node] is the left child, children[2 * node + 1] the right one
+        self.children = children
+        self.values = values
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.classes = classes
+        self.n_trees = len(roots)
+
+    @classmethod
+    def from_sklearn(cls, model: Any, scaler: Any) -> "CompiledForest":
+        n_classes = len(model.classes_)
+        features, thresholds, children, values, roots = [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            node_count = tree.node_count
+            node_ids = np.arange(node_count, dtype=np.intp) + offset
+            is_leaf = tree.children_left == -1
+
+            left = np.where(is_leaf, node_ids, tree.children_left + offset)
+            right = np.where(is_leaf, node_ids, tree.children_right + offset)
+
+            leaf_values = np.array(tree.value[:, 0, :n_classes], dtype=np.float64)
+            normalizer = leaf_values.sum(axis=1, keepdims=True)
+            # sklearn >= 1.4 stores class fractions and returns them as-is;
+            # older releases store counts and normalize in predict_proba
+            if not np.allclose(normalizer[normalizer > 0.0], 1.0):
+                normalizer[normalizer == 0.0] = 1.0
+                leaf_values /= normalizer
+
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            children.append(np.column_stack((left, right)).ravel())
+            values.append(leaf_values)
+            roots.append(offset)
+
+            max_depth = max(max_depth, tree.max_depth)
+            offset += node_count
+
+        return cls(
+            mean=np.asarray(scaler.mean_, dtype=np.float64),
+            scale=np.asarray(scaler.scale_, dtype=np.float64),
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            children=np.concatenate(children).astype(np.intp),
+            values=np.ascontiguousarray(np.concatenate(values)),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max_depth,
+            classes=np.asarray(model.classes_)
+        )
+
+    def transform(self, features_matrix: np.ndarray) -> np.ndarray:
+        """StandardScaler.transform followed by the float32 cast sklearn trees apply"""
+        return ((features_matrix - self.mean) / self.scale).astype(np.float32)
+
+    def predict_proba_row(self, features: np.ndarray) -> np.ndarray:
+        """Class probabilities for a single feature vector"""
+        return self.predict_proba_row_scaled(self.transform(features))
+
+    def predict_proba_row_scaled(self, x: np.ndarray) -> np.ndarray:
+        """predict_proba_row for a vector that already went through transform"""
+        feature, threshold, children = self.feature, self.threshold, self.children
+
+        nodes = self.roots
+        for _ in range(self.max_depth):
+            nodes = children[2 * nodes + (x[feature[nodes]] > threshold[nodes])]
+
+        return self.values[nodes].sum(axis=0) / self.n_trees
+
+    def predict_proba(self, features_matrix: np.ndarray) -> np.ndarray:
+        """Class probabilities for an (N, n_features) matrix"""
+        return self.predict_proba_scaled(self.transform(features_matrix))
+
+    def predict_proba_scaled(self, X: np.ndarray) -> np.ndarray:
+        """predict_proba for a matrix that already went through transform"""
+        feature, threshold, children = self.feature, self.threshold, self.children
+
+        # nodes has shape (n_trees, N): one walker per tree and row
+        rows = np.arange(X.shape[0], dtype=np.intp)[np.newaxis, :]
+        nodes = np.repeat(self.roots[:, np.newaxis], X.shape[0], axis=1)
+        for _ in range(self.max_depth):
+            nodes = children[2 * nodes + (X[rows, feature[nodes]] > threshold[nodes])]
+
+        # Summing over the leading axis accumulates trees in order, like sklearn
+        return self.values[nodes].sum(axis=0) / self.n_trees
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "engine": "compiled",
+            "n_trees": self.n_trees,
+            "n_nodes": int(self.feature.shape[0]),
+            "max_depth": self.max_depth,
+            "nbytes": int(sum(a.nbytes for a in (self.feature, self.threshold, self.children, self.values)))
+        }
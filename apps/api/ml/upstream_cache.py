@@ -0,0 +1,151 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Union
+
+
+class _Entry:
+    __slots__ = ("value", "fetched_at", "ttl")
+
+    def __init__(self, value: Any, fetched_at: float, ttl: float):
+        self.value = value
+        self.fetched_at = fetched_at
+        self.ttl = ttl
+
+
+class AsyncUpstreamCache:
+    """
+    Read-through cache for upstream API responses, for coroutine fetchers on
+    one event loop.
+
+    An entry is fresh for its ttl, which may be computed from the fetched
+    value (e.g. shorter while a match is live). For stale_window seconds after
+    that it is still served, while a single background refresh runs. Older
+    entries are fetched before returning. Concurrent misses for one key share a
+    single upstream call. When a fetch fails, the last good value is served for
+    up to max_stale seconds after it was fetched, and only then does the error
+    reach the caller. Background refreshes and shared misses run as their own
+    tasks, so a caller that is cancelled (e.g. by a client disconnect) never
+    cancels a fetch that other callers are waiting on. Cached values are shared
+    between callers and must be treated as read-only.
+    """
+
+    def __init__(self, stale_window: float = 300.0, max_stale: float = 3600.0, max_entries: int = 1000):
+        self.stale_window = stale_window
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.shared_fetches = 0
+        self.refreshes = 0
+        self.errors = 0
+        self.served_on_error = 0
+
+    async def get(self, key: Hashable, fetch: Callable[[], Awaitable[Any]],
+                  ttl: Union[float, Callable[[Any], float]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            age = time.monotonic() - entry.fetched_at
+            if age < entry.ttl:
+                self.hits += 1
+                return entry.value
+            if age < entry.ttl + self.stale_window:
+                self.stale_hits += 1
+                if key not in self._inflight:
+                    self._inflight[key] = self._spawn(key, fetch, ttl)
+                    self.refreshes += 1
+                return entry.value
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = self._spawn(key, fetch, ttl)
+            self.misses += 1
+        else:
+            self.shared_fetches += 1
+
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return self._last_good(key, e)
+
+    def _last_good(self, key: Hashable, error: Exception) -> Any:
+        """After a failed fetch: the last value if it is younger than max_stale, else re-raise"""
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry.fetched_at < self.max_stale:
+            self.served_on_error += 1
+            return entry.value
+        raise error
+
+    def _spawn(self, key: Hashable, fetch: Callable[[], Awaitable[Any]],
+               ttl: Union[float, Callable[[Any], float]]) -> asyncio.Task:
+        task = asyncio.ensure_future(self._load(key, fetch, ttl))
+        self._tasks.add(task)
+        task.add_done_callback(self._finished)
+        return task
+
+    def _finished(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        # A failed background refresh has no awaiting caller; mark its error as seen
+        if not task.cancelled():
+            task.exception()
+
+    async def _load(self, key: Hashable, fetch: Callable[[], Awaitable[Any]],
+                    ttl: Union[float, Callable[[Any], float]]) -> Any:
+        """Fetch and store one key; the result is shared by every caller waiting on it"""
+        try:
+            value = await fetch()
+            entry = _Entry(value, time.monotonic(), ttl(value) if callable(ttl) else ttl)
+        except asyncio.CancelledError:
+            self._failed(key, counted=False)
+            raise
+        except Exception:
+            self._failed(key)
+            raise
+        self._store(key, entry)
+        return value
+
+    def _store(self, key: Hashable, entry: _Entry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._inflight.pop(key, None)
+
+    def _failed(self, key: Hashable, counted: bool = True) -> None:
+        if counted:
+            self.errors += 1
+        self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses + self.shared_fetches
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "stale_window_seconds": self.stale_window,
+            "max_stale_seconds": self.max_stale,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "shared_fetches": self.shared_fetches,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            "background_refreshes": self.refreshes,
+            "inflight": len(self._inflight),
+            "errors": self.errors,
+            "served_on_error": self.served_on_error
+        }
+
+    def cancel(self) -> None:
+        """Cancel in-flight fetches, e.g. before the HTTP client they use is closed"""
+        for task in list(self._tasks):
+            task.cancel()